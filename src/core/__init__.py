@@ -2,7 +2,9 @@
 
 from .constants import (
     BASE_DIR, CONFIG_FILE, CATEGORIES_FILE, LOG_FILE, PREFS_FILE, CACHE_DIR,
+    URL_VALIDATION_CACHE_FILE, URL_VALIDATION_CACHE_TTL, INSTALLED_MODS_CACHE_FILE,
     URL_VALIDATION_TIMEOUT_HEAD, REQUEST_TIMEOUT, MIN_FREE_SPACE_GB, CHUNK_SIZE,
+    STALE_RUN_TMPDIR_AGE,
     MAX_DOWNLOAD_WORKERS, MAX_VALIDATION_WORKERS,
     MAX_RETRIES, RETRY_DELAY, BACKOFF_MULTIPLIER, CACHE_TIMEOUT,
     UI_BOTTOM_BUTTON_HEIGHT, UI_MIN_WINDOW_WIDTH, UI_MIN_WINDOW_HEIGHT,
@@ -16,7 +18,9 @@ from .archive_extractor import ArchiveExtractor
 
 __all__ = [
     'BASE_DIR', 'CONFIG_FILE', 'CATEGORIES_FILE', 'LOG_FILE', 'PREFS_FILE', 'CACHE_DIR',
+    'URL_VALIDATION_CACHE_FILE', 'URL_VALIDATION_CACHE_TTL', 'INSTALLED_MODS_CACHE_FILE',
     'URL_VALIDATION_TIMEOUT_HEAD', 'REQUEST_TIMEOUT', 'MIN_FREE_SPACE_GB', 'CHUNK_SIZE',
+    'STALE_RUN_TMPDIR_AGE',
     'MAX_DOWNLOAD_WORKERS', 'MAX_VALIDATION_WORKERS',
     'MAX_RETRIES', 'RETRY_DELAY', 'BACKOFF_MULTIPLIER', 'CACHE_TIMEOUT',
     'UI_BOTTOM_BUTTON_HEIGHT', 'UI_MIN_WINDOW_WIDTH', 'UI_MIN_WINDOW_HEIGHT',
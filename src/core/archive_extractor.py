@@ -1,5 +1,10 @@
+import os
+import ntpath
 import zipfile
 import shutil
+import json
+import stat
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from utils.symbols import LogSymbols, UISymbols
 
@@ -12,24 +17,75 @@ except ImportError:
 from utils.mod_utils import (
     extract_mod_id_from_text,
     extract_mod_version_from_text,
-    compare_versions
+    compare_versions,
+    read_mod_info_metadata
 )
 from utils.error_messages import suggest_fix_for_error, get_user_friendly_error
 
+# Written into each mod folder this installer extracts: the modlist version it installed
+# plus the (mtime_ns, size) of the mod_info.json it came with
+INSTALLED_VERSION_SIDECAR = ".installer_version"
+
+
+# Characters zipfile.extract() replaces with '_' on Windows, where file names cannot contain them
+_WINDOWS_ILLEGAL_NAME_CHARS = str.maketrans(':<>|"?*', '_' * 7)
+_WINDOWS_NAMES = os.sep == '\\'
+
+
+def _read_mod_info_head(fileobj, need_id=False):
+    """version (and id, with need_id) of a binary mod_info.json, reading past the head only if needed."""
+    return read_mod_info_metadata(
+        fileobj,
+        lambda text: {'version': extract_mod_version_from_text(text),
+                      'id': extract_mod_id_from_text(text) if need_id else None},
+        ('version', 'id') if need_id else ('version',)
+    )
+
+
+def _zip_member_parts(filename):
+    """Path components zipfile.extract() would write a member to.
+    
+    Empty, '.' and '..' parts are dropped; on Windows backslashes also split, a drive is
+    removed, illegal characters become '_' and trailing dots and spaces are stripped.
+    """
+    if _WINDOWS_NAMES:
+        filename = ntpath.splitdrive(filename.replace('/', '\\'))[1].replace('\\', '/')
+    parts = [part for part in filename.split('/') if part not in ('', '.', '..')]
+    if _WINDOWS_NAMES:
+        parts = [part.translate(_WINDOWS_ILLEGAL_NAME_CHARS).rstrip(' .') for part in parts]
+        parts = [part for part in parts if part]
+    return parts
 
-import os
 
 class ArchiveExtractor:
     
     def __init__(self, log_callback):
         self.log = log_callback
+        self._resolved_mods_dirs = {}
+    
+    @contextmanager
+    def open_archive(self, temp_file, is_7z):
+        """Open an archive once for metadata reads and extraction; yields None if it can't be opened."""
+        archive = None
+        try:
+            if not is_7z:
+                archive = zipfile.ZipFile(temp_file, 'r')
+            elif HAS_7ZIP:
+                archive = py7zr.SevenZipFile(temp_file, 'r')
+        except Exception:
+            archive = None
+        try:
+            yield archive
+        finally:
+            if archive is not None:
+                archive.close()
     
-    def extract_archive(self, temp_file, mods_dir, is_7z, expected_mod_version=None):
+    def extract_archive(self, temp_file, mods_dir, is_7z, expected_mod_version=None, archive=None):
         try:
             if is_7z:
-                return self._extract_7z(temp_file, mods_dir, expected_mod_version)
+                return self._extract_7z(temp_file, mods_dir, expected_mod_version, archive)
             else:
-                return self._extract_zip(temp_file, mods_dir, expected_mod_version)
+                return self._extract_zip(temp_file, mods_dir, expected_mod_version, archive)
         except PermissionError as e:
             self.log(f"  {LogSymbols.ERROR} Permission denied: {e}", error=True)
             friendly_msg = get_user_friendly_error('permission_denied')
@@ -54,15 +110,22 @@ class ArchiveExtractor:
                 self.log(f"\n{friendly_msg}", error=True)
             return False
     
-    def _extract_7z(self, temp_file, mods_dir, expected_mod_version=None):
+    def _extract_7z(self, temp_file, mods_dir, expected_mod_version=None, archive=None):
         if not HAS_7ZIP:
             self.log(f"  {LogSymbols.ERROR} Error: py7zr library not installed. Install with: pip install py7zr", error=True)
             return False
         
         try:
-            with py7zr.SevenZipFile(temp_file, 'r') as archive:
-                all_names = archive.getnames()
-                members = [m for m in all_names if m and not m.endswith('/')]
+            owned = archive is None
+            with (py7zr.SevenZipFile(temp_file, 'r') if owned else nullcontext(archive)) as archive:
+                if not owned:
+                    # Rewind the shared handle after any metadata read
+                    archive.reset()
+                # Zip-slip protection: validate all paths stay within mods_dir
+                members = self._safe_members(archive.list(), mods_dir)
+                if members is None:
+                    self.log(f"  {LogSymbols.ERROR} Security: Path traversal or symlink detected in archive (blocked)", error=True)
+                    return False
                 
                 if not members:
                     self.log(f"  {LogSymbols.ERROR} Error: Archive is empty", error=True)
@@ -73,36 +136,36 @@ class ArchiveExtractor:
                 if already_result:
                     return already_result
 
-                # Zip-slip protection: validate all paths stay within mods_dir
-                mods_dir_resolved = mods_dir.resolve()
-                for member in all_names:
-                    member_path = (mods_dir / member).resolve()
-                    try:
-                        member_path.relative_to(mods_dir_resolved)
-                    except ValueError:
-                        self.log(f"  {LogSymbols.ERROR} Security: Attempted path traversal detected in archive (blocked)", error=True)
-                        return False
-
                 self.log("  Extracting...")
+                # extractall streams members to disk; batching extract(targets=...) would
+                # re-decode solid blocks from the start for every batch
                 archive.extractall(path=mods_dir)
                 # Clean up macOS metadata after extraction
                 self._cleanup_macos_metadata(mods_dir)
+                self._write_version_sidecar(members, mods_dir, expected_mod_version)
                 return True
                 
         except py7zr.Bad7zFile:
             self.log(f"  {LogSymbols.ERROR} Error: Corrupted 7z file", error=True)
             return False
     
-    def _extract_zip(self, temp_file, mods_dir, expected_mod_version=None):
-        with zipfile.ZipFile(temp_file, 'r') as zip_ref:
-            members = [m for m in zip_ref.namelist() if m and not m.endswith('/')]
+    def _extract_zip(self, temp_file, mods_dir, expected_mod_version=None, archive=None):
+        with (zipfile.ZipFile(temp_file, 'r') if archive is None else nullcontext(archive)) as zip_ref:
+            # Zip-slip protection: validate all paths
+            # One pass over infolist(): members, zip-slip and the mod_info.json entries
+            mod_infos = {}
+            members = self._safe_members(zip_ref.infolist(), mods_dir, mod_infos)
+            if members is None:
+                self.log(f"  {LogSymbols.ERROR} Security: Path traversal or symlink detected in archive (blocked)", error=True)
+                return False
             
             if not members:
                 self.log(f"  {LogSymbols.ERROR} Error: Archive is empty", error=True)
                 return False
 
             already_result = self._check_if_installed(zip_ref, members, mods_dir, 
-                                                     expected_mod_version=expected_mod_version)
+                                                     expected_mod_version=expected_mod_version,
+                                                     mod_infos=mod_infos)
             
             # Handle update case: delete old version first
             if isinstance(already_result, tuple):
@@ -117,22 +180,84 @@ class ArchiveExtractor:
             elif already_result:
                 return already_result
 
-            # Zip-slip protection: validate all paths
-            mods_dir_resolved = mods_dir.resolve()
-            for member in zip_ref.namelist():
-                member_path = (mods_dir / member).resolve()
-                try:
-                    member_path.relative_to(mods_dir_resolved)
-                except ValueError:
-                    self.log(f"  {LogSymbols.ERROR} Security: Attempted path traversal detected in archive (blocked)", error=True)
-                    return False
-
             self.log("  Extracting...")
-            zip_ref.extractall(mods_dir)
+            self._copy_zip_members(zip_ref, mods_dir)
             # Clean up macOS metadata after extraction
             self._cleanup_macos_metadata(mods_dir)
+            self._write_version_sidecar(members, mods_dir, expected_mod_version)
             return True
 
+    @staticmethod
+    def _copy_zip_members(zip_ref, mods_dir):
+        """extractall() with the same member-name sanitising, minus its per-member overhead.
+        
+        Parent directories are created once each, empty files are only touched and each
+        member is copied with a buffer sized to the member (capped at 1 MiB).
+        """
+        base = os.fspath(mods_dir)
+        made_dirs = set()
+        for info in zip_ref.infolist():
+            parts = _zip_member_parts(info.filename)
+            if not parts:
+                continue
+            target = os.path.join(base, *parts)
+            if info.is_dir():
+                if target not in made_dirs:
+                    os.makedirs(target, exist_ok=True)
+                    made_dirs.add(target)
+                continue
+            parent = os.path.dirname(target)
+            if parent not in made_dirs:
+                os.makedirs(parent, exist_ok=True)
+                made_dirs.add(parent)
+            if info.file_size == 0:
+                open(target, 'wb').close()
+                continue
+            with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, min(info.file_size, 1 << 20))
+
+    def _resolved_mods_dir(self, mods_dir):
+        """(resolved mods_dir, same with a trailing separator) as strings, resolved once per mods_dir."""
+        key = os.fspath(mods_dir)
+        resolved = self._resolved_mods_dirs.get(key)
+        if resolved is None:
+            root = str(Path(mods_dir).resolve())
+            resolved = self._resolved_mods_dirs[key] = (root, root.rstrip(os.sep) + os.sep)
+        return resolved
+
+    @staticmethod
+    def _is_symlink_entry(entry):
+        if isinstance(entry, zipfile.ZipInfo):
+            return stat.S_ISLNK(entry.external_attr >> 16)
+        return bool(getattr(entry, 'is_symlink', False))
+
+    def _safe_members(self, entries, mods_dir, mod_infos=None):
+        """File members of an archive, or None if any entry is unsafe to extract into mods_dir.
+        
+        Single pass over the names (or ZipInfo / py7zr FileInfo entries); the check is lexical,
+        with mods_dir resolved once. Absolute paths, drive letters, '..' components (with either
+        separator) and symlink members are all rejected, whatever the host OS.
+        mod_info.json entries are collected into mod_infos if given.
+        """
+        root, base = self._resolved_mods_dir(mods_dir)
+        members = []
+        for entry in entries:
+            name = getattr(entry, 'filename', entry)
+            if not name:
+                continue
+            normalized = name.replace('\\', '/')
+            if (normalized.startswith('/') or ntpath.splitdrive(name)[0]
+                    or '..' in normalized.split('/') or self._is_symlink_entry(entry)):
+                return None
+            target = os.path.normpath(os.path.join(base, name))
+            if target != root and not target.startswith(base):
+                return None
+            if not name.endswith('/'):
+                members.append(name)
+                if mod_infos is not None and (name == 'mod_info.json' or name.endswith('/mod_info.json')):
+                    mod_infos[name] = entry
+        return members
+
     def _cleanup_macos_metadata(self, mods_dir):
         """Remove __MACOSX, .DS_Store, and AppleDouble (._*) files from mods_dir recursively."""
         import fnmatch
@@ -156,30 +281,95 @@ class ArchiveExtractor:
                         self.log(f"  {LogSymbols.WARNING} Could not remove {fpath}: {e}", info=True)
             return True
     
-    def _check_if_installed(self, archive_ref, members, mods_dir, is_7z=False, expected_mod_version=None):
+    @staticmethod
+    def _single_root(members):
+        """The one top-level folder shared by all members, or None."""
+        # First path component of each member; stop at the second distinct one
+        root_dir = None
+        for m in members:
+            root = m.replace('\\', '/').partition('/')[0]
+            if not root:
+                continue
+            if root_dir is None:
+                root_dir = root
+            elif root != root_dir:
+                return None
+        return root_dir
+
+    def _write_version_sidecar(self, members, mods_dir, expected_mod_version):
+        if not expected_mod_version:
+            return
+        root_dir = self._single_root(members)
+        if root_dir is None:
+            return
+        mod_root = mods_dir / root_dir
+        try:
+            st = os.stat(mod_root / "mod_info.json")
+            with open(mod_root / INSTALLED_VERSION_SIDECAR, 'w', encoding='utf-8') as f:
+                json.dump({'version': expected_mod_version, 'mod_info': [st.st_mtime_ns, st.st_size]}, f)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _read_version_sidecar(mod_root, installed_mod_info):
+        """Version recorded at install time, or None if missing or mod_info.json changed since."""
+        try:
+            with open(mod_root / INSTALLED_VERSION_SIDECAR, 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+            st = os.stat(installed_mod_info)
+            if sidecar.get('mod_info') != [st.st_mtime_ns, st.st_size]:
+                return None
+            return sidecar.get('version') or None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _compare_installed(self, mod_root, mod_id, installed_version, version_to_install):
+        # Compare versions using centralized function
+        version_comparison = compare_versions(version_to_install, installed_version)
+        
+        if version_comparison > 0:
+            # Newer version available
+            self.log(f"  {UISymbols.ARROW_UP} Update available: '{mod_id}' {installed_version} {LogSymbols.ARROW_RIGHT} {version_to_install}", info=True)
+            self.log(f"  Installing newer version...", info=True)
+            return (mod_root, True)
+        
+        # Same or older version
+        status = "newer" if version_comparison < 0 else "already"
+        self.log(f"  {LogSymbols.INFO} Skipped: '{mod_id}' v{installed_version} {status} installed", info=True)
+        return 'skipped'
+
+    def _check_if_installed(self, archive_ref, members, mods_dir, is_7z=False, expected_mod_version=None,
+                            mod_infos=None):
         # For ZIP: compare versions. For 7z: only check existence.
         # Returns: 'skipped' | (folder_path, True) for update | False for not installed
-        top_level = set(Path(m).parts[0] for m in members if Path(m).parts)
+        root_dir = self._single_root(members)
 
         # Early return: archive has multiple files at root level
-        if len(top_level) != 1:
+        if root_dir is None:
             # Ignore common macOS metadata entries when checking overlaps
             IGNORE_TOP_LEVEL = {"__MACOSX"}
+            # One listing of mods_dir; only members under an existing top-level name are stat-ed.
+            # Casefolded so case-insensitive filesystems still get probed.
+            try:
+                with os.scandir(mods_dir) as entries:
+                    existing = {entry.name.casefold() for entry in entries}
+            except OSError:
+                existing = set()
             for member in members:
-                parts = Path(member).parts
-                if not parts:
+                top = member.replace('\\', '/').partition('/')[0]
+                if not top:
                     continue
-                top = parts[0]
                 if top in IGNORE_TOP_LEVEL or top.startswith("._"):
                     continue
-                if (mods_dir / Path(member)).exists():
+                if top.casefold() not in existing:
+                    continue
+                if mods_dir.joinpath(member).exists():
                     self.log(f"  {LogSymbols.INFO} Skipped: Installation would overlap existing files (conflict: {member})", info=True)
                     return 'skipped'
             # No overlaps detected among meaningful entries; proceed with extraction
             return False
         
         # Archive has a single root folder
-        root_dir = next(iter(top_level))
         mod_root = mods_dir / root_dir
         
         # Early return: mod not installed yet
@@ -194,40 +384,41 @@ class ArchiveExtractor:
         # For ZIP, check version in mod_info.json
         mod_info_path_in_archive = f"{root_dir}/mod_info.json"
         installed_mod_info = mod_root / "mod_info.json"
+        if mod_infos is not None:
+            # ZipInfo found during the member pass; open() then skips the name lookup
+            archive_mod_info = mod_infos.get(mod_info_path_in_archive)
+        else:
+            try:
+                # getinfo() is a dict lookup on the central directory, unlike `in members`
+                archive_mod_info = archive_ref.getinfo(mod_info_path_in_archive)
+            except KeyError:
+                archive_mod_info = None
         
         # Early return: no mod_info.json available
-        if mod_info_path_in_archive not in members or not installed_mod_info.exists():
+        if archive_mod_info is None or not installed_mod_info.exists():
             self.log(f"  {LogSymbols.INFO} Skipped: Mod '{root_dir}' already installed", info=True)
             return 'skipped'
         
+        # Installed by us with an unchanged mod_info.json: no need to read either copy
+        if expected_mod_version:
+            sidecar_version = self._read_version_sidecar(mod_root, installed_mod_info)
+            if sidecar_version:
+                return self._compare_installed(mod_root, root_dir, sidecar_version, expected_mod_version)
+        
         try:
             # Read version info
-            with open(installed_mod_info, 'r', encoding='utf-8') as f:
-                installed_content = f.read()
+            with open(installed_mod_info, 'rb') as f:
+                installed_version = _read_mod_info_head(f)['version']
             
-            with archive_ref.open(mod_info_path_in_archive) as archive_file:
-                new_content = archive_file.read().decode('utf-8')
+            with archive_ref.open(archive_mod_info) as archive_file:
+                new_info = _read_mod_info_head(archive_file, need_id=True)
             
-            installed_version = extract_mod_version_from_text(installed_content)
-            new_version = extract_mod_version_from_text(new_content)
-            mod_id = extract_mod_id_from_text(new_content) or root_dir
+            new_version = new_info['version']
+            mod_id = new_info['id'] or root_dir
             
             # Use expected_mod_version from modlist config if provided, otherwise use archive version
             version_to_install = expected_mod_version if expected_mod_version else new_version
-            
-            # Compare versions using centralized function
-            version_comparison = compare_versions(version_to_install, installed_version)
-            
-            if version_comparison > 0:
-                # Newer version available
-                self.log(f"  {UISymbols.ARROW_UP} Update available: '{mod_id}' {installed_version} {LogSymbols.ARROW_RIGHT} {version_to_install}", info=True)
-                self.log(f"  Installing newer version...", info=True)
-                return (mod_root, True)
-            
-            # Same or older version
-            status = "newer" if version_comparison < 0 else "already"
-            self.log(f"  {LogSymbols.INFO} Skipped: '{mod_id}' v{installed_version} {status} installed", info=True)
-            return 'skipped'
+            return self._compare_installed(mod_root, mod_id, installed_version, version_to_install)
             
         except (IOError, UnicodeDecodeError) as e:
             self.log(f"  {LogSymbols.WARNING} Warning: Error reading mod metadata - {type(e).__name__}", info=True)
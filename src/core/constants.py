@@ -28,6 +28,8 @@ PREFS_FILE = CONFIG_DIR / "installer_prefs.json"
 PRESETS_DIR = CONFIG_DIR / "presets"
 LOG_FILE = BASE_DIR / "modlist_installer.log"
 CACHE_DIR = BASE_DIR / "mod_cache"
+URL_VALIDATION_CACHE_FILE = CACHE_DIR / "url_validation.json"
+INSTALLED_MODS_CACHE_FILE = CACHE_DIR / "installed_mods.json"
 
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -35,14 +37,17 @@ CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
 # Network timeouts & download
 URL_VALIDATION_TIMEOUT_HEAD = 6
 REQUEST_TIMEOUT = 30
-CHUNK_SIZE = 8192
+CHUNK_SIZE = 256 * 1024
 MIN_FREE_SPACE_GB = 5
+# modlist_run_* scratch dirs older than this were left by a crashed run and may be removed
+STALE_RUN_TMPDIR_AGE = 86400
 
 # Retry & backoff
 MAX_RETRIES = 3
 RETRY_DELAY = 2
 BACKOFF_MULTIPLIER = 2
 CACHE_TIMEOUT = 3600
+URL_VALIDATION_CACHE_TTL = 86400
 
 # Thread pools
 MAX_DOWNLOAD_WORKERS = 3
@@ -1,8 +1,12 @@
 import requests
+import urllib3
 import zipfile
 import tempfile
 import os
+import io
+import shutil
 import json
+import threading
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict, Any, Union
 
@@ -12,6 +16,12 @@ try:
 except ImportError:
     HAS_7ZIP = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .constants import REQUEST_TIMEOUT, CHUNK_SIZE, MAX_RETRIES
 from .archive_extractor import ArchiveExtractor
 from model_types import DownloadResult
@@ -22,39 +32,130 @@ from utils.mod_utils import (
     compare_versions,
     is_mod_name_match,
     scan_installed_mods,
+    scan_installed_mods_cached,
+    InstalledModIndex,
     is_mod_up_to_date,
     resolve_mod_dependencies,
     extract_major_version,
-    read_mod_info_from_archive
+    read_mod_info_from_archive,
+    read_mod_info_from_open_archive
 )
 from utils.error_messages import suggest_fix_for_error, get_user_friendly_error
-from utils.network_utils import retry_with_backoff, fix_google_drive_url
+from utils.network_utils import retry_with_backoff, fix_google_drive_url, get_session
+
+
+ZIP_MAGIC = b'PK\x03\x04'
+SEVENZIP_MAGIC = b"7z\xbc\xaf'\x1c"
+
+
+def _safe_unlink(path) -> None:
+    """Remove a file, ignoring it if already gone or locked."""
+    try:
+        os.unlink(path)
+    except (FileNotFoundError, OSError, PermissionError):
+        pass
 
 
 class ModInstaller:
     
-    def __init__(self, log_callback):
+    def __init__(self, log_callback, session=None, installed_cache_file=None):
         self.log = log_callback
+        self.session = session or get_session()
+        # Optional on-disk cache of parsed mod_info.json files, reused across runs
+        self.installed_cache_file = installed_cache_file
         self.extractor = ArchiveExtractor(log_callback)
+        self._installed_cache = None
+        self._config_batch = None
+        self._run_tmpdir = None
+        self._run_tmpdir_lock = threading.Lock()
+    
+    def _get_run_tmpdir(self) -> str:
+        """One scratch directory per installer run for downloads and metadata reads."""
+        with self._run_tmpdir_lock:
+            if self._run_tmpdir is None or not os.path.isdir(self._run_tmpdir):
+                self._run_tmpdir = tempfile.mkdtemp(prefix='modlist_run_')
+            return self._run_tmpdir
+    
+    def close(self) -> None:
+        """Remove the run's scratch directory and anything still in it."""
+        with self._run_tmpdir_lock:
+            if self._run_tmpdir:
+                shutil.rmtree(self._run_tmpdir, ignore_errors=True)
+                self._run_tmpdir = None
+    
+    def get_installed_mods(self, mods_dir: Path) -> InstalledModIndex:
+        """Return the indexed scan of mods_dir, cached until the next extraction.
+        
+        The cache is also keyed on the folder's mtime, so mods added or removed outside the
+        installer trigger a rescan.
+        """
+        try:
+            mtime = os.stat(mods_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        key = (Path(mods_dir), mtime)
+        if self._installed_cache is None or self._installed_cache[0] != key:
+            if self.installed_cache_file:
+                entries = scan_installed_mods_cached(key[0], self.installed_cache_file)
+            else:
+                entries = scan_installed_mods(key[0])
+            self._installed_cache = (key, InstalledModIndex(entries))
+        return self._installed_cache[1]
+    
+    def invalidate_installed_cache(self) -> None:
+        self._installed_cache = None
+    
+    @staticmethod
+    def _index_config_mods(config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        by_name = {}
+        for mod in config.get('mods', []):
+            by_name.setdefault(mod.get('name'), mod)
+        return by_name
+    
+    def begin_batch_metadata_update(self, config_manager) -> None:
+        """Load the config once; update_mod_metadata_in_config() edits it in memory until commit."""
+        config = config_manager.load_modlist_config()
+        self._config_batch = {'config': config, 'by_name': self._index_config_mods(config), 'dirty': False}
+    
+    def commit_batch_metadata_update(self, config_manager) -> bool:
+        """Save the batched config if anything changed and end the batch."""
+        batch, self._config_batch = self._config_batch, None
+        if not batch or not batch['dirty']:
+            return False
+        try:
+            config_manager.save_modlist_config(batch['config'])
+            return True
+        except Exception as e:
+            self.log(f"  {LogSymbols.WARNING} Could not save metadata: {e}", debug=True)
+            return False
     
     def update_mod_metadata_in_config(self, mod_name: str, detected_metadata: Dict[str, Any], config_manager) -> bool:
         if not detected_metadata:
             return False
         
         try:
-            config = config_manager.load_modlist_config()
+            batch = self._config_batch
+            if batch:
+                by_name = batch['by_name']
+            else:
+                config = config_manager.load_modlist_config()
+                by_name = self._index_config_mods(config)
             updated = False
             
-            for mod in config.get('mods', []):
-                if mod.get('name') == mod_name:
-                    for key, config_key in [('version', 'mod_version'), ('id', 'mod_id'), ('gameVersion', 'gameVersion')]:
-                        if detected_metadata.get(key):
-                            mod[config_key] = detected_metadata[key]
-                            updated = True
-                    break
+            mod = by_name.get(mod_name)
+            if mod is not None:
+                for key, config_key in [('version', 'mod_version'), ('id', 'mod_id'), ('gameVersion', 'gameVersion'),
+                                        ('download_etag', 'download_etag'),
+                                        ('download_last_modified', 'download_last_modified')]:
+                    if detected_metadata.get(key):
+                        mod[config_key] = detected_metadata[key]
+                        updated = True
             
             if updated:
-                config_manager.save_modlist_config(config)
+                if batch:
+                    batch['dirty'] = True
+                else:
+                    config_manager.save_modlist_config(config)
                 self.log(f"  {LogSymbols.INFO} Updated metadata for {mod_name}", debug=True)
             
             return updated
@@ -81,11 +182,8 @@ class ModInstaller:
                     self.log(f"  {LogSymbols.SUCCESS} {mod['name']} installed successfully")
                 return success
             finally:
-                if result.temp_path and Path(result.temp_path).exists():
-                    try:
-                        Path(result.temp_path).unlink()
-                    except (OSError, PermissionError):
-                        pass
+                if result.temp_path:
+                    _safe_unlink(result.temp_path)
             
         except requests.exceptions.RequestException as e:
             self.log(f"  {LogSymbols.ERROR} Download error: {e}", error=True)
@@ -95,13 +193,38 @@ class ModInstaller:
             self.log(f"  {LogSymbols.ERROR} Unexpected error: {e}", error=True)
         return False
 
-    def download_archive(self, mod: Dict[str, Any], skip_gdrive_check: bool = False) -> DownloadResult:
+    def download_archive(self, mod: Dict[str, Any], skip_gdrive_check: bool = False,
+                         if_changed: bool = False) -> DownloadResult:
+        """Download a mod archive to a temp file.
+        
+        With if_changed, the ETag/Last-Modified stored from the previous download are sent and an
+        unchanged archive returns DownloadResult('NOT_MODIFIED', False); pass it only when no update
+        is expected. Retries resume a partial temp file with a Range request guarded by If-Range,
+        so a server whose file changed (or that ignores Range) sends it whole and the file restarts.
+        """
         temp_path = None
+        range_validator = None
         
         def attempt_download():
-            nonlocal temp_path
+            nonlocal temp_path, range_validator
             url_to_use = mod['download_url']
-            response = requests.get(url_to_use, stream=True, timeout=REQUEST_TIMEOUT)
+            resume_from = os.path.getsize(temp_path) if temp_path and os.path.exists(temp_path) else 0
+            headers = {}
+            if resume_from:
+                # Without a validator a changed file could be spliced; a plain GET restarts it instead
+                if range_validator:
+                    headers['Range'] = f'bytes={resume_from}-'
+                    headers['If-Range'] = range_validator
+            elif if_changed:
+                if mod.get('download_etag'):
+                    headers['If-None-Match'] = mod['download_etag']
+                if mod.get('download_last_modified'):
+                    headers['If-Modified-Since'] = mod['download_last_modified']
+            
+            response = self.session.get(url_to_use, stream=True, timeout=REQUEST_TIMEOUT, headers=headers)
+            if response.status_code == 304:
+                response.close()
+                return DownloadResult('NOT_MODIFIED', False)
             response.raise_for_status()
             
             url_lower = url_to_use.lower()
@@ -132,7 +255,7 @@ class ModInstaller:
                             self.log(f"  [fix] Google Drive: Download URL fixed for {mod.get('name', 'Unknown')}", info=True)
                         # Retry immediately with fixed direct download URL
                         url_to_use = fixed_url
-                        response = requests.get(url_to_use, stream=True, timeout=REQUEST_TIMEOUT)
+                        response = self.session.get(url_to_use, stream=True, timeout=REQUEST_TIMEOUT)
                         response.raise_for_status()
                         url_lower = url_to_use.lower()
                         content_type = response.headers.get('Content-Type', '').lower()
@@ -142,25 +265,66 @@ class ModInstaller:
                         return DownloadResult('GDRIVE_HTML', False)
             
             is_7z = '.7z' in url_lower or '7z' in content_type or '.7z' in content_disposition
-            temp_fd, temp_path = tempfile.mkstemp(suffix='.7z' if is_7z else '.zip', prefix='modlist_')
-            
-            with os.fdopen(temp_fd, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
-                    if chunk:
-                        f.write(chunk)
+            if response.status_code != 206:
+                # If-Range needs a strong ETag; Last-Modified is the fallback validator
+                etag = response.headers.get('ETag', '')
+                range_validator = etag if etag and not etag.startswith('W/') else response.headers.get('Last-Modified')
+            if resume_from:
+                # 206 continues the partial file; any other success status restarts it
+                f = open(temp_path, 'ab' if response.status_code == 206 else 'wb', buffering=CHUNK_SIZE)
+            else:
+                temp_fd, temp_path = tempfile.mkstemp(suffix='.7z' if is_7z else '.zip', prefix='modlist_',
+                                                      dir=self._get_run_tmpdir())
+                f = os.fdopen(temp_fd, 'wb', buffering=CHUNK_SIZE)
             
-            if not self._validate_archive_integrity(temp_path, is_7z):
+            # Short reads from the socket coalesce into CHUNK_SIZE writes instead of 8 KiB ones
+            with f:
                 try:
-                    os.unlink(temp_path)
-                except (OSError, PermissionError):
-                    pass
+                    if isinstance(getattr(response, 'raw', None), io.IOBase):
+                        # Copy the raw stream in C instead of looping over chunks in Python
+                        response.raw.decode_content = True
+                        shutil.copyfileobj(response.raw, f, CHUNK_SIZE)
+                    else:
+                        # Empty keep-alive chunks are no-op writes; no need to test for them
+                        write = f.write
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            write(chunk)
+                except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+                    raise requests.exceptions.ChunkedEncodingError(f"Download interrupted: {e}") from e
+                written = f.tell()
+            
+            # urllib3 1.x does not enforce Content-Length, so a cut-off body would end quietly;
+            # raising here keeps the partial file for a ranged retry
+            try:
+                expected = int(response.headers.get('Content-Length', ''))
+            except (TypeError, ValueError):
+                expected = None
+            if expected is not None:
+                expected += resume_from if response.status_code == 206 else 0
+                if written < expected:
+                    raise requests.exceptions.ChunkedEncodingError(
+                        f"Download interrupted: {written} of {expected} bytes received")
+            
+            archive_format = self._validate_archive_integrity(temp_path)
+            if not archive_format:
+                _safe_unlink(temp_path)
+                temp_path = None
                 raise ValueError("Downloaded file is not a valid archive")
+            # The URL/header guess only named the temp file; the signature decides how it's opened
+            is_7z = archive_format == '7z'
+            
+            if response.headers.get('ETag'):
+                mod['download_etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                mod['download_last_modified'] = response.headers['Last-Modified']
             
             return DownloadResult(temp_path, is_7z)
         
         try:
+            # The session adapter already retries connects and 5xx; only a stream cut mid-body
+            # (resumed with Range) or an invalid archive is retried here
             return retry_with_backoff(attempt_download, max_retries=MAX_RETRIES, 
-                                     exceptions=(requests.exceptions.RequestException, ValueError))
+                                     exceptions=(requests.exceptions.ChunkedEncodingError, ValueError))
         except requests.exceptions.RequestException as e:
             self.log(f"  {LogSymbols.ERROR} Download failed after {MAX_RETRIES} attempts: {type(e).__name__}", error=True)
             error_type = suggest_fix_for_error(e)
@@ -173,81 +337,130 @@ class ModInstaller:
         except Exception as e:
             self.log(f"  {LogSymbols.ERROR} Unexpected download error: {e}", error=True)
         
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except (OSError, PermissionError):
-                pass
+        if temp_path:
+            _safe_unlink(temp_path)
         return DownloadResult(None, False)
     
-    def _validate_archive_integrity(self, file_path: str, is_7z: bool) -> bool:
-        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
-            return False
+    def _validate_archive_integrity(self, file_path: str, deep: bool = False) -> Optional[str]:
+        """Cheap size/signature check returning the archive format ('zip' or '7z'), or None if invalid.
+        
+        The format comes from the magic bytes, not from the URL or headers. A body with neither
+        signature (an HTML error page, a Google Drive interstitial) is rejected. deep=True also
+        opens the archive and CRC-checks every member; the default skips that on purpose:
+        extraction does it anyway, so a corrupt body still fails, just later.
+        """
+        try:
+            file_size = os.stat(file_path).st_size
+        except OSError:
+            return None
+        if file_size == 0:
+            return None
         
-        file_size = os.path.getsize(file_path)
+        try:
+            with open(file_path, 'rb') as f:
+                header = f.read(6)
+        except OSError:
+            return None
         
-        if is_7z:
-            if not HAS_7ZIP:
-                return True
+        if header == SEVENZIP_MAGIC:
+            if not deep or not HAS_7ZIP:
+                return '7z'
             try:
                 with py7zr.SevenZipFile(file_path, 'r') as archive:
-                    archive.getnames()
-                return True
+                    return '7z' if archive.testzip() is None else None
             except Exception:
-                return file_size > 0
+                return '7z'
         
+        if not header.startswith(ZIP_MAGIC):
+            return None
+        if not deep:
+            # download_archive already rejects a body shorter than Content-Length, and the
+            # extractor opens the central directory right after; parsing it here too is redundant
+            return 'zip'
         try:
             with zipfile.ZipFile(file_path, 'r') as zf:
-                return zf.testzip() is None
+                if not zf.namelist():
+                    return None
+                return 'zip' if zf.testzip() is None else None
         except zipfile.BadZipFile:
-            return file_size > 0
+            return 'zip'
         except Exception:
-            return False
+            return None
     
-    def extract_archive(self, temp_file: str, mods_dir: Path, is_7z: bool, expected_mod_version: Optional[str] = None):
-        return self.extractor.extract_archive(temp_file, mods_dir, is_7z, expected_mod_version)
+    def open_archive(self, temp_file: Union[str, Path], is_7z: bool):
+        return self.extractor.open_archive(temp_file, is_7z)
+    
+    def extract_archive(self, temp_file: str, mods_dir: Path, is_7z: bool, expected_mod_version: Optional[str] = None,
+                        archive=None):
+        try:
+            return self.extractor.extract_archive(temp_file, mods_dir, is_7z, expected_mod_version, archive)
+        finally:
+            self.invalidate_installed_cache()
 
-    def extract_mod_metadata(self, archive_path: Union[str, Path], is_7z: bool = False) -> Optional[Dict[str, Any]]:
+    def extract_mod_metadata(self, archive_path: Union[str, Path], is_7z: bool = False,
+                             archive=None) -> Optional[Dict[str, Any]]:
         """Extract metadata from mod_info.json in archive without full extraction.
         
         Args:
             archive_path: Path to archive file (str or Path object)
             is_7z: Whether archive is 7z format
+            archive: Optional handle from open_archive() to read from instead of reopening
             
         Returns:
             Dict with metadata or None if extraction fails
         """
+        if archive is not None:
+            return read_mod_info_from_open_archive(archive, is_7z)
         if isinstance(archive_path, str):
             archive_path = Path(archive_path)
         return read_mod_info_from_archive(archive_path, is_7z)
 
-    def update_enabled_mods(self, mods_dir: Path, installed_mod_names: List[str], merge: bool = True) -> bool:
+    def update_enabled_mods(self, mods_dir: Path, installed_mod_names: List[str], merge: bool = True,
+                            durable: bool = False) -> bool:
+        """Write enabled_mods.json atomically; durable=True also fsyncs it before the swap."""
         try:
             enabled_mods_file = mods_dir / "enabled_mods.json"
             existing_ids = []
+            have_existing = False
             
             if merge and enabled_mods_file.exists():
                 try:
-                    with open(enabled_mods_file, 'r', encoding='utf-8') as f:
-                        existing_ids = json.load(f).get('enabledMods', [])
+                    with open(enabled_mods_file, 'rb') as f:
+                        data = f.read()
+                        existing_ids = (orjson.loads(data) if HAS_ORJSON else json.loads(data)).get('enabledMods', [])
+                        have_existing = True
                         self.log(f"  Found {len(existing_ids)} previously enabled mod(s)", debug=True)
                 except (json.JSONDecodeError, IOError) as e:
                     self.log(f"  {LogSymbols.WARNING} Could not read enabled_mods.json: {e}", info=True)
             
-            new_ids = []
+            # One scan for all names instead of a filtered scan per mod
+            ids_by_folder = {folder.name: metadata.get('id') for folder, metadata in self.get_installed_mods(mods_dir)}
+            # Insertion-ordered dict: dedups IDs and doubles as the membership set for the merge
+            new_ids = {}
             for mod_name in installed_mod_names:
-                for folder, metadata in scan_installed_mods(mods_dir, lambda f, c: f.name == mod_name):
-                    if mod_id := metadata.get('id'):
-                        new_ids.append(mod_id)
-                        self.log(f"  {LogSymbols.SUCCESS} Found mod ID '{mod_id}' for {mod_name}", debug=True)
-                        break
+                if mod_id := ids_by_folder.get(mod_name):
+                    new_ids[mod_id] = None
+                    self.log(f"  {LogSymbols.SUCCESS} Found mod ID '{mod_id}' for {mod_name}", debug=True)
+            
+            enabled_ids = [id for id in existing_ids if id not in new_ids] if merge else []
+            enabled_ids.extend(new_ids)
+            
+            if have_existing and enabled_ids == existing_ids:
+                self.log("  enabled_mods.json already up to date", debug=True)
+                return True
             
-            enabled_ids = [id for id in existing_ids if id not in new_ids] + new_ids if merge else new_ids
+            if HAS_ORJSON:
+                data = orjson.dumps({"enabledMods": enabled_ids}, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps({"enabledMods": enabled_ids}, indent=2).encode('utf-8')
             
-            temp_file = enabled_mods_file.with_suffix('.json.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump({"enabledMods": enabled_ids}, f, indent=2)
-            temp_file.replace(enabled_mods_file)
+            temp_file = f"{enabled_mods_file}.tmp"
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp_file, enabled_mods_file)
             
             return True
                 
@@ -262,25 +475,38 @@ class ModInstaller:
             if not modlist_lookup:
                 return []
             
-            for folder, metadata in scan_installed_mods(mods_dir):
+            # Case-fold each modlist name once; installed mods are matched by ID first
+            modlist_by_id = {mod['mod_id']: (name, mod) for name, mod in modlist_lookup.items() if mod.get('mod_id')}
+            # Longest names first, so "Foo Extended" is not claimed by a "Foo" entry
+            needles = sorted(((name, name.casefold(), mod) for name, mod in modlist_lookup.items() if name),
+                             key=lambda needle: len(needle[1]), reverse=True)
+            
+            installed_mods = self.get_installed_mods(mods_dir)
+            for position, (folder, metadata) in enumerate(installed_mods):
                 installed_version = metadata.get('version')
-                content = metadata.get('content')
                 
-                for modlist_name, modlist_mod in modlist_lookup.items():
-                    if modlist_name.lower() in content.lower() or modlist_name.lower() in folder.name.lower():
-                        expected_version = modlist_mod.get('version')
-                        
-                        if installed_version != 'unknown' and expected_version:
-                            if compare_versions(installed_version, expected_version) < 0:
-                                outdated_mods.append({
-                                    'name': modlist_name,
-                                    'folder': folder.name,
-                                    'installed_version': installed_version,
-                                    'expected_version': expected_version,
-                                    'mod_id': metadata.get('id') or folder.name
-                                })
-                                self.log(f"  {LogSymbols.WARNING} Outdated: {modlist_name} ({installed_version} < {expected_version})", info=True)
-                        break
+                match = modlist_by_id.get(metadata.get('id'))
+                if match is None:
+                    # Folded once per cached scan, not once per detection pass
+                    folder_folded, content_folded = installed_mods.casefolded(position)
+                    match = next(((modlist_name, modlist_mod) for modlist_name, needle, modlist_mod in needles
+                                  if needle in content_folded or needle in folder_folded), None)
+                if match is None:
+                    continue
+                
+                modlist_name, modlist_mod = match
+                expected_version = modlist_mod.get('version')
+                
+                if installed_version != 'unknown' and expected_version:
+                    if compare_versions(installed_version, expected_version) < 0:
+                        outdated_mods.append({
+                            'name': modlist_name,
+                            'folder': folder.name,
+                            'installed_version': installed_version,
+                            'expected_version': expected_version,
+                            'mod_id': metadata.get('id') or folder.name
+                        })
+                        self.log(f"  {LogSymbols.WARNING} Outdated: {modlist_name} ({installed_version} < {expected_version})", info=True)
             
             return outdated_mods
         except Exception as e:
@@ -297,7 +523,7 @@ class ModInstaller:
         
         incompatible_mods = []
         try:
-            for folder, metadata in scan_installed_mods(mods_dir):
+            for folder, metadata in self.get_installed_mods(mods_dir):
                 if mod_game_version := metadata.get('gameVersion'):
                     mod_major = extract_major_version(mod_game_version)
                     if mod_major and mod_major != expected_major:
@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk, filedialog
+from tkinter import ttk, filedialog, font as tkfont
 import threading
 import re
 from pathlib import Path
@@ -8,7 +8,23 @@ from utils.theme import AppTheme
 from utils.symbols import LogSymbols, UISymbols
 
 
-def _create_dialog(parent, title, width=None, height=None, resizable=False):
+# Named fonts shared by every dialog, keyed per Tk interpreter; holding the Font keeps it alive
+_FONT_CACHE = {}
+
+
+def _font(widget, family, size, *styles):
+    """Return a shared Font for ("Arial", 11, "bold")-style specs instead of re-resolving the tuple per widget."""
+    key = (widget.tk, family, size, styles)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        font = _FONT_CACHE[key] = tkfont.Font(
+            root=widget, family=family, size=size,
+            weight='bold' if 'bold' in styles else 'normal',
+            slant='italic' if 'italic' in styles else 'roman')
+    return font
+
+
+def _create_dialog(parent, title, width=None, height=None, resizable=False, withdrawn=False):
     """Create a centered Toplevel dialog with consistent styling.
     
     Args:
@@ -17,18 +33,22 @@ def _create_dialog(parent, title, width=None, height=None, resizable=False):
         width: Fixed width (if None, auto-size)
         height: Fixed height (if None, auto-size)
         resizable: Whether dialog is resizable
+        withdrawn: Keep the dialog hidden (and ungrabbed) until _reveal_dialog()
     
     Returns:
         tk.Toplevel: Configured dialog
     """
     dialog = tk.Toplevel(parent)
+    if withdrawn:
+        dialog.withdraw()
     dialog.title(title)
     if width and height:
         dialog.geometry(f"{width}x{height}")
     dialog.resizable(resizable, resizable)
     dialog.configure(bg=AppTheme.SURFACE)
     dialog.transient(parent)
-    dialog.grab_set()
+    if not withdrawn:
+        dialog.grab_set()
     return dialog
 
 
@@ -40,13 +60,34 @@ def _center_dialog(dialog, parent):
             return
             
         dialog.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() - dialog.winfo_width()) // 2
-        y = parent.winfo_y() + (parent.winfo_height() - dialog.winfo_height()) // 2
+        # A withdrawn dialog has no real size yet; its requested size is what it will map at
+        if dialog.winfo_ismapped():
+            width, height = dialog.winfo_width(), dialog.winfo_height()
+        else:
+            width, height = dialog.winfo_reqwidth(), dialog.winfo_reqheight()
+        x = parent.winfo_x() + (parent.winfo_width() - width) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - height) // 2
         dialog.geometry(f"+{x}+{y}")
     except (tk.TclError, AttributeError):
         pass
 
 
+def _reveal_dialog(dialog, parent):
+    """Center a dialog built while withdrawn, then map and grab it.
+    
+    Building hidden means Tk lays the whole widget tree out once, instead of
+    re-laying out a visible window after every pack().
+    """
+    _center_dialog(dialog, parent)
+    dialog.deiconify()
+    try:
+        dialog.grab_set()
+    except tk.TclError:
+        # The window manager may not have mapped it yet
+        dialog.wait_visibility()
+        dialog.grab_set()
+
+
 def _create_form_field(parent, row, label_text, widget_type='entry', width=45, **widget_kwargs):
     """Create a form field with label and widget.
     
@@ -80,14 +121,41 @@ def _create_form_field(parent, row, label_text, widget_type='entry', width=45, *
     return label, widget
 
 
+# Closed StyledDialog windows, withdrawn and keyed by (parent, dialog_type), reused by the next dialog.
+# Each entry is (window, [(sequence, funcid), ...]) so the previous dialog's bindings can be removed.
+# A window is popped while shown, so a dialog opened from inside another never gets the same one.
+_DIALOG_POOL = {}
+
+
+def _reset_pooled_dialog(dialog, bindings):
+    """Strip a pooled window back to an empty Toplevel before a new dialog is built in it.
+    
+    Bindings go first, so destroying the old widgets cannot reach the previous dialog's handlers.
+    """
+    for sequence, funcid in bindings:
+        dialog.unbind(sequence, funcid)
+    dialog.protocol("WM_DELETE_WINDOW", "")
+    for child in dialog.winfo_children():
+        child.destroy()
+
+
 class StyledDialog:
     def __init__(self, parent, title, message, dialog_type="info", buttons=None):
         self.result = None
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        self.dialog.resizable(False, False)
-        self.dialog.configure(bg=AppTheme.SURFACE)
+        self._pool_key = (parent, dialog_type)
+        pooled, bindings = _DIALOG_POOL.pop(self._pool_key, (None, ()))
+        if pooled is not None and pooled.winfo_exists():
+            self.dialog = pooled
+            _reset_pooled_dialog(self.dialog, bindings)
+        else:
+            self.dialog = tk.Toplevel(parent)
+            self.dialog.withdraw()
+            self.dialog.transient(parent)
+            self.dialog.resizable(False, False)
+            self.dialog.configure(bg=AppTheme.SURFACE)
+        self.dialog.title(title)
+        # The window outlives the dialog, so show() waits on this instead of on destruction
+        self._closed = tk.BooleanVar(self.dialog, value=False)
         
         # Main content frame
         content_frame = tk.Frame(self.dialog, bg=AppTheme.SURFACE)
@@ -100,10 +168,10 @@ class StyledDialog:
         # Icon
         icons = {"info": LogSymbols.INFO, "success": LogSymbols.SUCCESS, "warning": LogSymbols.WARNING, "error": LogSymbols.ERROR, "question": LogSymbols.QUESTION}
         tk.Label(message_frame, text=icons.get(dialog_type, LogSymbols.INFO), 
-            font=("Arial", 36, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.PRIMARY).pack(side=tk.LEFT, padx=(0, 15))
+            font=_font(self.dialog, "Arial", 36, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.PRIMARY).pack(side=tk.LEFT, padx=(0, 15))
         
         # Message
-        tk.Label(message_frame, text=message, font=("Arial", 11),
+        tk.Label(message_frame, text=message, font=_font(self.dialog, "Arial", 11),
             wraplength=350, justify=tk.LEFT, bg=AppTheme.SURFACE, fg=AppTheme.TEXT_PRIMARY).pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Buttons
@@ -125,20 +193,29 @@ class StyledDialog:
                                 width=12, button_type=btn_type)
             btn.pack(side=tk.LEFT, padx=5)
         
-        # Keyboard bindings
-        self.dialog.bind("<Return>", lambda e: self._on_button_click(buttons[0][1]))
-        self.dialog.bind("<Escape>", lambda e: self._on_button_click(False if dialog_type == "question" else True))
+        # Keyboard bindings; funcids are kept so a reuse of this window can unbind them
+        self._bindings = [
+            ("<Return>", self.dialog.bind("<Return>", lambda e: self._on_button_click(buttons[0][1]))),
+            ("<Escape>", self.dialog.bind("<Escape>", lambda e: self._on_button_click(False if dialog_type == "question" else True))),
+            ("<Destroy>", self.dialog.bind("<Destroy>", lambda e: self._closed.set(True) if e.widget is self.dialog else None)),
+        ]
+        # Closing from the title bar leaves result as None, like a destroyed dialog did
+        self.dialog.protocol("WM_DELETE_WINDOW", lambda: self._on_button_click(None))
         
-        _center_dialog(self.dialog, parent)
+        _reveal_dialog(self.dialog, parent)
         
     def _on_button_click(self, value):
         """Handle button click."""
         self.result = value
-        self.dialog.destroy()
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+        _DIALOG_POOL[self._pool_key] = (self.dialog, self._bindings)
+        self._closed.set(True)
         
     def show(self):
         """Show dialog and wait for result."""
-        self.dialog.wait_window()
+        if not self._closed.get():
+            self.dialog.wait_variable(self._closed)
         return self.result
 
 
@@ -193,13 +270,13 @@ def ask_version_action(title, message, parent=None):
 def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, other_domains, failed_list):
     result = {'action': 'cancel'}
     
-    dialog = _create_dialog(parent, "Download Sources Analysis")
+    dialog = _create_dialog(parent, "Download Sources Analysis", withdrawn=True)
     
     main_frame = tk.Frame(dialog, bg=AppTheme.SURFACE)
     main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
     
     tk.Label(main_frame, text="Download Sources Analysis", 
-             font=("Arial", 14, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.TEXT_PRIMARY).pack(pady=(0, 15))
+             font=_font(dialog, "Arial", 14, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.TEXT_PRIMARY).pack(pady=(0, 15))
     
     # Summary frame
     summary_frame = tk.Frame(main_frame, bg=AppTheme.SURFACE)
@@ -211,17 +288,16 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
         github_frame.pack(fill=tk.X, pady=(0, 8))
         
         tk.Label(github_frame, text=f"{LogSymbols.SUCCESS} {len(github_mods)} mod(s) from GitHub", 
-                font=("Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.GITHUB_FG).pack(anchor=tk.W)
+                font=_font(dialog, "Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.GITHUB_FG).pack(anchor=tk.W)
         
         # List GitHub mods
         github_list_frame = tk.Frame(github_frame, bg=AppTheme.GITHUB_BG)
         github_list_frame.pack(fill=tk.X, padx=(20, 0), pady=(4, 0))
         
         github_text = tk.Text(github_list_frame, height=min(4, len(github_mods)), width=55,
-                     font=("Courier", 9), wrap=tk.WORD, bg=AppTheme.GITHUB_BG, fg=AppTheme.TEXT_PRIMARY, 
+                     font=_font(dialog, "Courier", 9), wrap=tk.WORD, bg=AppTheme.GITHUB_BG, fg=AppTheme.TEXT_PRIMARY, 
                              relief=tk.FLAT, highlightthickness=0, borderwidth=0)
-        for mod in github_mods:
-            github_text.insert(tk.END, f"  • {mod.get('name', 'Unknown')}\n")
+        github_text.insert(tk.END, "".join(f"  • {mod.get('name', 'Unknown')}\n" for mod in github_mods))
         github_text.config(state=tk.DISABLED)
         github_text.pack(padx=5, pady=5)
     
@@ -231,17 +307,16 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
         mediafire_frame.pack(fill=tk.X, pady=(0, 8))
         
         tk.Label(mediafire_frame, text=f"{LogSymbols.SUCCESS} {len(mediafire_mods)} mod(s) from Mediafire", 
-            font=("Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.MEDIAFIRE_FG).pack(anchor=tk.W)
+            font=_font(dialog, "Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.MEDIAFIRE_FG).pack(anchor=tk.W)
         
         # List Mediafire mods
         mediafire_list_frame = tk.Frame(mediafire_frame, bg=AppTheme.MEDIAFIRE_BG)
         mediafire_list_frame.pack(fill=tk.X, padx=(20, 0), pady=(4, 0))
         
         mediafire_text = tk.Text(mediafire_list_frame, height=min(4, len(mediafire_mods)), width=55,
-                     font=("Courier", 9), wrap=tk.WORD, bg=AppTheme.MEDIAFIRE_BG, fg=AppTheme.TEXT_PRIMARY, 
+                     font=_font(dialog, "Courier", 9), wrap=tk.WORD, bg=AppTheme.MEDIAFIRE_BG, fg=AppTheme.TEXT_PRIMARY, 
                              relief=tk.FLAT, highlightthickness=0, borderwidth=0)
-        for mod in mediafire_mods:
-            mediafire_text.insert(tk.END, f"  • {mod.get('name', 'Unknown')}\n")
+        mediafire_text.insert(tk.END, "".join(f"  • {mod.get('name', 'Unknown')}\n" for mod in mediafire_mods))
         mediafire_text.config(state=tk.DISABLED)
         mediafire_text.pack(padx=5, pady=5)
     
@@ -251,12 +326,12 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
         gdrive_frame.pack(fill=tk.X, pady=(0, 8))
         
         tk.Label(gdrive_frame, text=f"{LogSymbols.SUCCESS} {len(gdrive_mods)} mod(s) from Google Drive", 
-            font=("Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.GDRIVE_FG).pack(anchor=tk.W)
+            font=_font(dialog, "Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.GDRIVE_FG).pack(anchor=tk.W)
         
         # Info about large files
         info_text = tk.Label(gdrive_frame, 
             text="Some Google Drive links are not direct downloads and may require an additional action. The app will attempt to auto-fix them.",
-            font=("Arial", 9, "italic"), bg=AppTheme.SURFACE, fg=AppTheme.TEXT_PRIMARY, wraplength=450, justify=tk.LEFT)
+            font=_font(dialog, "Arial", 9, "italic"), bg=AppTheme.SURFACE, fg=AppTheme.TEXT_PRIMARY, wraplength=450, justify=tk.LEFT)
         info_text.pack(anchor=tk.W, padx=(20, 0), pady=(2, 0))
         
         # List Google Drive mods
@@ -264,8 +339,9 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
         gdrive_list_frame.pack(fill=tk.X, padx=(20, 0), pady=(4, 0))
         
         gdrive_text = tk.Text(gdrive_list_frame, height=min(4, len(gdrive_mods)), width=55,
-                     font=("Courier", 9), wrap=tk.WORD, bg=AppTheme.GDRIVE_BG, fg=AppTheme.TEXT_PRIMARY, 
+                     font=_font(dialog, "Courier", 9), wrap=tk.WORD, bg=AppTheme.GDRIVE_BG, fg=AppTheme.TEXT_PRIMARY, 
                              relief=tk.FLAT, highlightthickness=0, borderwidth=0)
+        gdrive_lines = []
         for mod in gdrive_mods:
             name = mod.get('name', 'Unknown')
             url = mod.get('download_url', '')
@@ -279,7 +355,8 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
             has_export_id = 'export=download' in url and 'id=' in url
             needs_fix = is_gdrive and not (is_usercontent or has_confirm or has_export_id)
             suffix = " [may need fix]" if needs_fix else ""
-            gdrive_text.insert(tk.END, f"  • {name}{suffix}\n")
+            gdrive_lines.append(f"  • {name}{suffix}\n")
+        gdrive_text.insert(tk.END, "".join(gdrive_lines))
         gdrive_text.config(state=tk.DISABLED)
         gdrive_text.pack(padx=5, pady=5)
     
@@ -290,19 +367,18 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
         
         total_other = sum(len(mods) for mods in other_domains.values())
         tk.Label(other_frame, text=f"{LogSymbols.WARNING} {total_other} mod(s) from other sources", 
-            font=("Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.OTHER_FG).pack(anchor=tk.W)
+            font=_font(dialog, "Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.OTHER_FG).pack(anchor=tk.W)
         
         # List each domain with its mods
         other_list_frame = tk.Frame(other_frame, bg=AppTheme.OTHER_BG)
         other_list_frame.pack(fill=tk.X, padx=(20, 0), pady=(4, 0))
         
         other_text = tk.Text(other_list_frame, height=min(5, total_other), width=55,
-                    font=("Courier", 9), wrap=tk.WORD, bg=AppTheme.OTHER_BG, fg=AppTheme.TEXT_PRIMARY, 
+                    font=_font(dialog, "Courier", 9), wrap=tk.WORD, bg=AppTheme.OTHER_BG, fg=AppTheme.TEXT_PRIMARY, 
                             relief=tk.FLAT, highlightthickness=0, borderwidth=0)
         
-        for domain, mods in sorted(other_domains.items()):
-            for mod in mods:
-                other_text.insert(tk.END, f"  • {mod.get('name', 'Unknown')} ({domain})\n")
+        other_text.insert(tk.END, "".join(f"  • {mod.get('name', 'Unknown')} ({domain})\n"
+                                          for domain, mods in sorted(other_domains.items()) for mod in mods))
         
         other_text.config(state=tk.DISABLED)
         other_text.pack(padx=5, pady=5)
@@ -313,24 +389,22 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
         failed_frame.pack(fill=tk.X, pady=(0, 0))
         
         tk.Label(failed_frame, text=f"{LogSymbols.ERROR} {len(failed_list)} mod(s) inaccessible", 
-            font=("Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.FAILED_FG).pack(anchor=tk.W, pady=(0, 2))
+            font=_font(dialog, "Arial", 11, "bold"), bg=AppTheme.SURFACE, fg=AppTheme.FAILED_FG).pack(anchor=tk.W, pady=(0, 2))
         
         tk.Label(failed_frame, 
             text="These mods cannot be downloaded. Check URLs or contact mod authors.",
-            font=("Arial", 9, "italic"), bg=AppTheme.SURFACE, fg=AppTheme.TEXT_SECONDARY, wraplength=450, justify=tk.LEFT).pack(anchor=tk.W, padx=(20, 0), pady=(2, 0))
+            font=_font(dialog, "Arial", 9, "italic"), bg=AppTheme.SURFACE, fg=AppTheme.TEXT_SECONDARY, wraplength=450, justify=tk.LEFT).pack(anchor=tk.W, padx=(20, 0), pady=(2, 0))
         
         # Scrollable list of failed mods
         failed_list_frame = tk.Frame(failed_frame, bg=AppTheme.FAILED_BG)
         failed_list_frame.pack(fill=tk.X, padx=(20, 0), pady=(4, 0))
         
         failed_text = tk.Text(failed_list_frame, height=min(5, len(failed_list)), width=55, 
-                     font=("Courier", 9), wrap=tk.WORD, bg=AppTheme.FAILED_BG, fg=AppTheme.TEXT_PRIMARY, 
+                     font=_font(dialog, "Courier", 9), wrap=tk.WORD, bg=AppTheme.FAILED_BG, fg=AppTheme.TEXT_PRIMARY, 
                              relief=tk.FLAT, highlightthickness=0, borderwidth=0)
         
-        for fail in failed_list:
-            mod_name = fail['mod'].get('name', 'Unknown')
-            error = fail['error']
-            failed_text.insert(tk.END, f"  • {mod_name}: {error}\n")
+        failed_text.insert(tk.END, "".join(f"  • {fail['mod'].get('name', 'Unknown')}: {fail['error']}\n"
+                                           for fail in failed_list))
         
         failed_text.config(state=tk.DISABLED)
         failed_text.pack(padx=5, pady=5)
@@ -362,7 +436,7 @@ def show_validation_report(parent, github_mods, gdrive_mods, mediafire_mods, oth
     dialog.bind("<Escape>", lambda e: on_cancel())
     dialog.bind("<Return>", lambda e: on_continue() if len(github_mods) > 0 or len(gdrive_mods) > 0 or len(mediafire_mods) > 0 or other_domains else None)
     
-    _center_dialog(dialog, parent)
+    _reveal_dialog(dialog, parent)
     dialog.wait_window()
     return result['action']
 
@@ -1,11 +1,12 @@
 """Installation workflow: download, extraction, finalization."""
 
 import threading
+import queue
 import concurrent.futures
 from pathlib import Path
 from core import InstallationReport, MAX_DOWNLOAD_WORKERS
 from utils.mod_utils import is_mod_up_to_date, resolve_mod_dependencies
-from utils.mod_utils import scan_installed_mods, is_mod_name_match
+from utils.mod_utils import is_mod_name_match
 from utils.symbols import LogSymbols, UISymbols
 
 
@@ -13,15 +14,42 @@ class InstallationController:
     def __init__(self, main_window):
         self.window = main_window
         self.mod_installer = main_window.mod_installer
+        self._installed_names = set()
     
     def _set_progress(self, value):
         """Thread-safe progress bar update."""
         self.window.install_progress_bar['value'] = value
         self.window.root.update_idletasks()
         
-    def download_mods_parallel(self, mods_to_download, skip_gdrive_check=False, max_workers=None):
+    def _advance_progress(self, steps=1):
+        """Advance the shared download+extraction progress (each mod counts twice)."""
+        with self._progress_lock:
+            self._progress_done += steps
+            value = (self._progress_done / self._progress_total) * 100 if self._progress_total else 100
+        self.window.root.after(0, lambda v=value: self._set_progress(v))
+    
+    def _download_and_enqueue(self, mod, skip_gdrive_check, extract_queue, stop_event):
+        """Download one archive and hand it to the extractor; blocks while the queue is full."""
+        # Only installed mods with no known newer version can skip an unchanged archive
+        if_changed = mod.get('name') in self._installed_names
+        result = self.mod_installer.download_archive(mod, skip_gdrive_check, if_changed)
+        if not result.temp_path or result.temp_path in ('GDRIVE_HTML', 'NOT_MODIFIED'):
+            return result
+        while not stop_event.is_set():
+            try:
+                extract_queue.put((mod, result.temp_path, result.is_7z), timeout=0.1)
+                return result
+            except queue.Full:
+                continue
+        # Canceled before the extractor took it: nobody else will delete the archive
+        self.cleanup_remaining_downloads([(mod, result.temp_path, result.is_7z)])
+        return result._replace(temp_path=None)
+        
+    def download_mods_parallel(self, mods_to_download, extract_queue, stop_event, downloads_done,
+                               skip_gdrive_check=False, max_workers=None):
         download_results = []
         gdrive_failed = []
+        unchanged = []
         
         self.window.downloaded_temp_files = []
         
@@ -31,13 +59,13 @@ class InstallationController:
         self.window.current_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
         try:
             future_to_mod = {
-                self.window.current_executor.submit(self.mod_installer.download_archive, mod, skip_gdrive_check): mod
+                self.window.current_executor.submit(self._download_and_enqueue, mod, skip_gdrive_check, extract_queue, stop_event): mod
                 for mod in mods_to_download
             }
-            completed = 0
             for future in concurrent.futures.as_completed(future_to_mod):
                 if not self.window.is_installing:
                     self.window.log("Installation canceled by user", error=True)
+                    stop_event.set()
                     break
                 
                 while self.window.is_paused:
@@ -52,24 +80,29 @@ class InstallationController:
                     if result.temp_path == 'GDRIVE_HTML':
                         gdrive_failed.append(mod)
                         self.window.log(f"  {LogSymbols.WARNING}  Google Drive returned HTML (non-direct link): {mod.get('name')}", error=True)
+                        self._advance_progress(2)
+                    elif result.temp_path == 'NOT_MODIFIED':
+                        unchanged.append(mod)
+                        self.window.log(f"  {LogSymbols.INFO} Unchanged since last download: {mod.get('name')}", info=True)
+                        self._advance_progress(2)
                     elif result.temp_path:
                         download_results.append((mod, result.temp_path, result.is_7z))
                         self.window.downloaded_temp_files.append(result.temp_path)
                         self.window.log(f"  {LogSymbols.SUCCESS} Downloaded: {mod.get('name')}")
+                        self._advance_progress()
                     else:
                         self.window.log(f"  {LogSymbols.ERROR} Failed to download: {mod.get('name')}", error=True)
+                        self._advance_progress(2)
                 except Exception as e:
                     self.window.log(f"  {LogSymbols.ERROR} Download error for {mod.get('name')}: {e}", error=True)
-                    
-                completed += 1
-                progress_value = (completed / len(mods_to_download)) * 50
-                self.window.root.after(0, lambda v=progress_value: self._set_progress(v))
+                    self._advance_progress(2)
         finally:
             if self.window.current_executor:
                 self.window.current_executor.shutdown(wait=True)
                 self.window.current_executor = None
+            downloads_done.set()
         
-        return download_results, gdrive_failed
+        return download_results, gdrive_failed, unchanged
 
     def install_mods_internal(self, mods_to_install, skip_gdrive_check=False):
         report = InstallationReport()
@@ -81,13 +114,11 @@ class InstallationController:
 
         # Update metadata from installed mods for accurate version checking
         self.window.log("Scanning installed mods for metadata...")
+        self.mod_installer.invalidate_installed_cache()
+        installed_mods = self.mod_installer.get_installed_mods(mods_dir)
         self.update_mod_metadata_from_installed(mods_dir)
         
-        installed_mods_dict = {}
-        for folder, metadata in scan_installed_mods(mods_dir):
-            mod_id = metadata.get('id')
-            if mod_id:
-                installed_mods_dict[mod_id] = metadata
+        installed_mods_dict = {mod_id: metadata for mod_id, (folder, metadata) in installed_mods.by_id.items()}
 
         self.window.log("Resolving mod dependencies...")
         mods_to_install = resolve_mod_dependencies(mods_to_install, installed_mods_dict)
@@ -95,13 +126,14 @@ class InstallationController:
 
         # Filter: check which mods are already up-to-date
         mods_to_download = []
+        self._installed_names = set()
         pre_skipped = 0
         
         for mod in mods_to_install:
             mod_name = mod.get('name', 'Unknown')
             mod_version = mod.get('mod_version')
             
-            check = is_mod_up_to_date(mod_name, mod_version, mods_dir)
+            check = is_mod_up_to_date(mod_name, mod_version, mods_dir, installed_mods, mod.get('mod_id'))
             
             if check.is_current:
                 version_str = f" (v{check.installed_version})" if check.installed_version else ""
@@ -109,6 +141,9 @@ class InstallationController:
                 pre_skipped += 1
             else:
                 if check.installed_version is not None:
+                    # A known older version means an update is expected, so a 304 must not skip it
+                    if check.installed_version == 'unknown':
+                        self._installed_names.add(mod_name)
                     status = f"update ({check.installed_version} {LogSymbols.ARROW_RIGHT} {mod_version})" if mod_version else "update"
                     if mod_version:
                         report.add_updated(mod_name, check.installed_version, mod_version)
@@ -129,21 +164,45 @@ class InstallationController:
             self.finalize_installation_with_report(report, mods_dir, [], total_mods)
             return
 
+        # Downloads feed a single extractor thread so extraction of mod N overlaps download of mod N+1;
+        # the bounded queue keeps at most a couple of finished archives waiting on disk
+        self._progress_lock = threading.Lock()
+        self._progress_done = 0
+        self._progress_total = len(mods_to_download) * 2
+        extract_queue = queue.Queue(maxsize=2)
+        stop_event = threading.Event()
+        downloads_done = threading.Event()
+        extraction_results = {}
+        extractor = threading.Thread(
+            target=lambda: extraction_results.update(
+                result=self.extract_downloaded_mods_with_report(
+                    extract_queue, stop_event, downloads_done, mods_dir, report, len(mods_to_download)
+                )
+            ),
+            daemon=True
+        )
+        extractor.start()
+        
         self.window.log(f"\nStarting parallel downloads (workers={MAX_DOWNLOAD_WORKERS})...")
-        download_results, gdrive_failed = self.download_mods_parallel(
-            mods_to_download, 
+        download_results, gdrive_failed, unchanged = self.download_mods_parallel(
+            mods_to_download,
+            extract_queue,
+            stop_event,
+            downloads_done,
             skip_gdrive_check=skip_gdrive_check
         )
+        extractor.join()
         
         for mod in gdrive_failed:
             report.add_error(mod.get('name'), "Google Drive HTML response", mod.get('download_url'))
+        for mod in unchanged:
+            report.add_skipped(mod.get('name'), "unchanged since last download", mod.get('mod_version'))
         
         if not self.window.is_installing:
             self.finalize_installation_cancelled()
             return
         
-        extraction_results = self.extract_downloaded_mods_with_report(download_results, mods_dir, report)
-        extracted, skipped, extraction_failures = extraction_results
+        extracted, skipped, extraction_failures = extraction_results.get('result', (0, 0, []))
         
         for mod in extraction_failures:
             if mod not in gdrive_failed:
@@ -162,23 +221,44 @@ class InstallationController:
         self.window.install_modlist_btn.config(state='normal', text="Install Modlist")
         self.window.pause_install_btn.config(state='disabled')
     
-    def extract_downloaded_mods_with_report(self, download_results, mods_dir, report):
+    def extract_downloaded_mods_with_report(self, extract_queue, stop_event, downloads_done, mods_dir, report, total_mods):
+        # Drains (mod, temp_path, is_7z) items until all downloads are done; extraction stays sequential
         # Returns: (extracted_count, skipped_count, extraction_failures_list)
-        self.window.log("Starting sequential extraction...")
+        self.window.log("Extracting mods as downloads complete...")
+        # Config metadata is written once after the run instead of once per mod
+        self.mod_installer.begin_batch_metadata_update(self.window.config_manager)
+        try:
+            return self._drain_extract_queue(extract_queue, stop_event, downloads_done, mods_dir, report, total_mods)
+        finally:
+            # Never leave download workers blocked on a full queue
+            stop_event.set()
+            self.mod_installer.commit_batch_metadata_update(self.window.config_manager)
+    
+    def _drain_extract_queue(self, extract_queue, stop_event, downloads_done, mods_dir, report, total_mods):
         extracted = 0
         skipped = 0
         extraction_failures = []
         
-        if not download_results:
-            self.window.log("All mods were skipped (already installed or failed to download)", info=True)
-            self.window.root.after(0, lambda: self._set_progress(100))
-            return (0, 0, [])
-        
-        for i, (mod, temp_path, is_7z) in enumerate(download_results, 1):
-            if not self.window.is_installing:
-                self.window.log("\nInstallation canceled during extraction", error=True)
-                self.cleanup_remaining_downloads(download_results, i-1)
-                break
+        while True:
+            try:
+                item = extract_queue.get(timeout=0.1)
+            except queue.Empty:
+                if not downloads_done.is_set():
+                    continue
+                # Every put finished before downloads_done was set, so one last look catches an
+                # archive queued just after the timed-out get; empty now means really empty
+                try:
+                    item = extract_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            mod, temp_path, is_7z = item
+            if stop_event.is_set() or not self.window.is_installing:
+                if not stop_event.is_set():
+                    self.window.log("\nInstallation canceled during extraction", error=True)
+                    stop_event.set()
+                self.cleanup_remaining_downloads([item])
+                continue
                 
             while self.window.is_paused:
                 threading.Event().wait(0.1)
@@ -189,13 +269,17 @@ class InstallationController:
             self.window.root.after(0, lambda n=mod_name: self.window.current_mod_name.set(f"📦 Extracting: {n}"))
             
             version_str = f" v{mod_version}" if mod_version else ""
-            self.window.log(f"\n[{i}/{len(download_results)}] Installing {mod_name}{version_str}...")
+            self.window.log(f"\n[{extracted + skipped + 1}/{total_mods}] Installing {mod_name}{version_str}...")
             
             try:
-                metadata = self.auto_detect_game_version(mod, temp_path, is_7z)
-                
                 expected_mod_version = mod.get('mod_version')
-                success = self.mod_installer.extract_archive(Path(temp_path), mods_dir, is_7z, expected_mod_version)
+                with self.mod_installer.open_archive(Path(temp_path), is_7z) as archive:
+                    # Nothing to detect when the config already carries the full metadata
+                    metadata_known = (mod.get('mod_version') and mod.get('mod_id')
+                                      and (mod.get('gameVersion') or mod.get('game_version')))
+                    metadata = None if metadata_known else self.auto_detect_game_version(mod, temp_path, is_7z, archive)
+                    success = self.mod_installer.extract_archive(Path(temp_path), mods_dir, is_7z,
+                                                                 expected_mod_version, archive)
                 
                 try:
                     Path(temp_path).unlink()
@@ -209,8 +293,12 @@ class InstallationController:
                     self.window.log(f"  {LogSymbols.SUCCESS} {mod['name']} installed successfully", success=True)
                     extracted += 1
                     
-                    if metadata:
-                        self.mod_installer.update_mod_metadata_in_config(mod_name, metadata, self.window.config_manager)
+                    # Persist the download's ETag/Last-Modified alongside the archive metadata
+                    validators = {k: mod[k] for k in ('download_etag', 'download_last_modified') if mod.get(k)}
+                    if metadata or validators:
+                        self.mod_installer.update_mod_metadata_in_config(
+                            mod_name, {**(metadata or {}), **validators}, self.window.config_manager
+                        )
                     
                     detected_version = metadata.get('version') if metadata else expected_mod_version
                     report.add_installed(mod_name, detected_version)
@@ -223,21 +311,23 @@ class InstallationController:
                 extraction_failures.append(mod)
                 skipped += 1
             
-            progress = 50 + ((extracted + skipped) / len(download_results)) * 50
-            self.window.root.after(0, lambda v=progress: self._set_progress(v))
+            self._advance_progress()
+        
+        if not extracted and not skipped and not extraction_failures and self.window.is_installing:
+            self.window.log("All mods were skipped (already installed or failed to download)", info=True)
         
         return (extracted, skipped, extraction_failures)
     
-    def cleanup_remaining_downloads(self, download_results, start_index):
+    def cleanup_remaining_downloads(self, download_results, start_index=0):
         for _, remaining_temp_path, _ in download_results[start_index:]:
             try:
                 Path(remaining_temp_path).unlink()
             except Exception:
                 pass
     
-    def auto_detect_game_version(self, mod, temp_path, is_7z):
+    def auto_detect_game_version(self, mod, temp_path, is_7z, archive=None):
         try:
-            metadata = self.mod_installer.extract_mod_metadata(Path(temp_path), is_7z)
+            metadata = self.mod_installer.extract_mod_metadata(Path(temp_path), is_7z, archive)
             if metadata:
                 for m in self.window.modlist_data.get('mods', []):
                     if m['name'] == mod['name']:
@@ -258,8 +348,12 @@ class InstallationController:
         updated_count = 0
         
         mods = self.window.modlist_data.get('mods', [])
+        mods_by_id = {}
+        for mod in mods:
+            if mod.get('mod_id'):
+                mods_by_id.setdefault(mod['mod_id'], mod)
         
-        for folder, metadata in scan_installed_mods(mods_dir):
+        for folder, metadata in self.mod_installer.get_installed_mods(mods_dir):
             installed_id = metadata.get('id')
             installed_name = metadata.get('name')
             installed_version = metadata.get('version')
@@ -268,47 +362,43 @@ class InstallationController:
             if not installed_id:
                 continue
             
-            for mod in mods:
-                config_id = mod.get('mod_id')
-                config_name = mod.get('name', '')
-                
-                is_match = False
-                if config_id == installed_id:
-                    is_match = True
-                elif not config_id and config_name and installed_name:
-                    if is_mod_name_match(config_name, folder.name, installed_name):
-                        is_match = True
-                
-                if is_match:
-                    changed = False
-                    
-                    if not mod.get('mod_id'):
-                        mod['mod_id'] = installed_id
-                        changed = True
-                    
-                    if not mod.get('name') and installed_name:
-                        mod['name'] = installed_name
-                        changed = True
-                    
-                    if installed_version and installed_version != 'unknown':
-                        current_mod_version = mod.get('mod_version')
-                        if current_mod_version != installed_version:
-                            mod['mod_version'] = installed_version
-                            changed = True
-                    
-                    if installed_game_version:
-                        current_game_version = mod.get('game_version')
-                        if current_game_version != installed_game_version:
-                            mod['game_version'] = installed_game_version
-                            if 'version' in mod:
-                                del mod['version']
-                            changed = True
-                    
-                    if changed:
-                        updated_count += 1
-                        self.window.log(f"  {LogSymbols.SUCCESS} Updated metadata: {mod.get('name')} (ID: {installed_id})", info=True)
-                    
-                    break
+            # O(1) by ID; name matching only runs over config entries that still lack an ID
+            mod = mods_by_id.get(installed_id)
+            if mod is None and installed_name:
+                mod = next((m for m in mods if not m.get('mod_id') and m.get('name')
+                            and is_mod_name_match(m['name'], folder.name, installed_name)), None)
+            
+            if mod is None:
+                continue
+            
+            changed = False
+            
+            if not mod.get('mod_id'):
+                mod['mod_id'] = installed_id
+                mods_by_id[installed_id] = mod
+                changed = True
+            
+            if not mod.get('name') and installed_name:
+                mod['name'] = installed_name
+                changed = True
+            
+            if installed_version and installed_version != 'unknown':
+                current_mod_version = mod.get('mod_version')
+                if current_mod_version != installed_version:
+                    mod['mod_version'] = installed_version
+                    changed = True
+            
+            if installed_game_version:
+                current_game_version = mod.get('game_version')
+                if current_game_version != installed_game_version:
+                    mod['game_version'] = installed_game_version
+                    if 'version' in mod:
+                        del mod['version']
+                    changed = True
+            
+            if changed:
+                updated_count += 1
+                self.window.log(f"  {LogSymbols.SUCCESS} Updated metadata: {mod.get('name')} (ID: {installed_id})", info=True)
         
         if updated_count > 0:
             self.window.log(f"{LogSymbols.SUCCESS} Updated metadata for {updated_count} mod(s)")
@@ -12,7 +12,9 @@ import time
 
 from core import (
     LOG_FILE,
-    URL_VALIDATION_TIMEOUT_HEAD, MIN_FREE_SPACE_GB,
+    URL_VALIDATION_TIMEOUT_HEAD, URL_VALIDATION_CACHE_FILE, URL_VALIDATION_CACHE_TTL,
+    INSTALLED_MODS_CACHE_FILE,
+    MIN_FREE_SPACE_GB, STALE_RUN_TMPDIR_AGE,
     MAX_DOWNLOAD_WORKERS,
     UI_MIN_WINDOW_WIDTH, UI_MIN_WINDOW_HEIGHT,
     UI_DEFAULT_WINDOW_WIDTH, UI_DEFAULT_WINDOW_HEIGHT,
@@ -80,7 +82,7 @@ class ModlistInstaller:
         self.current_mod_name = tk.StringVar(value="")
         self.url_validator = URLValidator()
         
-        self.mod_installer = ModInstaller(self.log)
+        self.mod_installer = ModInstaller(self.log, installed_cache_file=INSTALLED_MODS_CACHE_FILE)
         self.installation_controller = None
         self.log_level = 'INFO'
         self.backup_manager = None  # Initialized after starsector_path is set
@@ -386,6 +388,7 @@ class ModlistInstaller:
             self.is_paused = False
         
         self.save_modlist_config()
+        self.mod_installer.close()
         self.log("Application closing...")
         self.root.destroy()
     
@@ -708,12 +711,13 @@ class ModlistInstaller:
             categories.setdefault(cat, []).append(mod)
         return categories
     
-    def _get_mod_installation_status(self, mod, mods_dir):
+    def _get_mod_installation_status(self, mod, mods_dir, installed_mods=None):
         """Check if mod is installed and up-to-date.
         
         Args:
             mod: Mod dictionary
             mods_dir: Path to mods directory
+            installed_mods: Optional pre-scanned installed mods
             
         Returns:
             tuple: (icon, tag) for display
@@ -723,7 +727,7 @@ class ModlistInstaller:
             mod_name = mod.get('name', '')
             expected_version = mod.get('mod_version')
             if mod_name:
-                check = is_mod_up_to_date(mod_name, expected_version, mods_dir)
+                check = is_mod_up_to_date(mod_name, expected_version, mods_dir, installed_mods, mod.get('mod_id'))
                 is_installed = check.is_current if expected_version else (check.installed_version is not None)
         
         icon = LogSymbols.INSTALLED if is_installed else LogSymbols.NOT_INSTALLED
@@ -750,13 +754,18 @@ class ModlistInstaller:
         
         starsector_path = self.starsector_path.get()
         mods_dir = Path(starsector_path) / "mods" if starsector_path else None
+        installed_mods = None
+        if mods_dir and mods_dir.exists():
+            # Rescan once per refresh; the folder may have changed outside the installer
+            self.mod_installer.invalidate_installed_cache()
+            installed_mods = self.mod_installer.get_installed_mods(mods_dir)
         
         for cat in self.categories:
             self.mod_listbox.insert(tk.END, f"{cat}\n", 'category')
             
             if cat in grouped_mods:
                 for mod in grouped_mods[cat]:
-                    icon, tag = self._get_mod_installation_status(mod, mods_dir)
+                    icon, tag = self._get_mod_installation_status(mod, mods_dir, installed_mods)
                     self.mod_listbox.insert(tk.END, f"  {icon} {mod['name']}\n", ('mod', tag))
         
         self.mod_listbox.config(state=tk.DISABLED)
@@ -1232,6 +1241,7 @@ class ModlistInstaller:
         mods_dir = starsector_dir / "mods"
         if mods_dir.exists():
             self.log("\nChecking for outdated mods...")
+            self.mod_installer.invalidate_installed_cache()
             outdated = self.mod_installer.detect_outdated_mods(mods_dir, self.modlist_data['mods'])
             
             if outdated:
@@ -1273,7 +1283,9 @@ class ModlistInstaller:
                 validation_result['data'] = validate_mod_urls(
                     self.modlist_data['mods'], 
                     progress_callback=None,
-                    timeout=URL_VALIDATION_TIMEOUT_HEAD
+                    timeout=URL_VALIDATION_TIMEOUT_HEAD,
+                    cache_path=URL_VALIDATION_CACHE_FILE,
+                    cache_ttl=URL_VALIDATION_CACHE_TTL
                 )
             except Exception as e:
                 validation_result['error'] = str(e)
@@ -1398,11 +1410,19 @@ class ModlistInstaller:
         temp_dir = tempfile.gettempdir()
         pattern = os.path.join(temp_dir, "modlist_*")
         
+        # Another running instance may own a recent scratch dir; ours is removed by close()
+        stale_before = time.time() - STALE_RUN_TMPDIR_AGE
+        
         for temp_file in glob.glob(pattern):
             try:
                 if os.path.isfile(temp_file):
                     os.unlink(temp_file)
                     deleted_count += 1
+                elif (os.path.isdir(temp_file) and os.path.basename(temp_file).startswith("modlist_run_")
+                      and os.path.getmtime(temp_file) < stale_before):
+                    # Scratch directories left behind by crashed installer runs
+                    shutil.rmtree(temp_file, ignore_errors=True)
+                    deleted_count += 1
             except (OSError, PermissionError):
                 pass  # Silently ignore files we can't delete
         
@@ -5,48 +5,80 @@ Includes both low-level utilities (parsing, extraction) and high-level operation
 
 Public API:
     High-level operations: refresh_mod_metadata(), enable_all_installed_mods(), check_mod_dependencies()
-    Metadata extraction: extract_all_metadata_from_text(), read_mod_info_from_archive()
+    Metadata extraction: extract_all_metadata_from_text(), read_mod_info_from_archive(),
+                         read_mod_info_from_open_archive()
     Low-level parsing: extract_mod_id_from_text(), extract_mod_version_from_text(), 
                        extract_game_version_from_text(), extract_dependencies_from_text()
     Version handling: compare_versions(), extract_major_version()
-    Mod scanning: scan_installed_mods(), is_mod_name_match(), is_mod_up_to_date()
+    Mod scanning: scan_installed_mods(), scan_installed_mods_cached(), InstalledModIndex, is_mod_name_match(), is_mod_up_to_date()
     Dependencies: resolve_mod_dependencies(), check_missing_dependencies()
 """
+import os
 import re
+import json
+from collections import deque
+from functools import lru_cache
+from itertools import zip_longest
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any, List
 import zipfile
 import tempfile
+import concurrent.futures
 from model_types import ModVersionCheck
 from utils.symbols import LogSymbols
 
+# Compiled once at import: these run for every mod_info.json read and every version comparison
+_NAME_SEPARATORS_RE = re.compile(r'[\s\-_]')
+_MOD_ID_RE = re.compile(r'["\']?id["\']?\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_MOD_NAME_RE = re.compile(r'["\']?name["\']?\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_VERSION_BLOCK_RE = re.compile(r'"?version"?\s*:\s*\{([^}]+)\}', re.IGNORECASE)
+_MAJOR_RE = re.compile(r'"?major"?\s*:\s*["\']?([0-9]+)', re.IGNORECASE)
+_MINOR_RE = re.compile(r'"?minor"?\s*:\s*["\']?([0-9]+)', re.IGNORECASE)
+_PATCH_RE = re.compile(r'"?patch"?\s*:\s*["\']?([0-9a-zA-Z]+)', re.IGNORECASE)
+_VERSION_STRING_RE = re.compile(r'(?<!game)"?version"?\s*:\s*["\']?([0-9]+[0-9a-zA-Z._-]*)', re.IGNORECASE)
+_GAME_VERSION_RE = re.compile(r'"?gameVersion"?\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_VERSION_TOKEN_RE = re.compile(r'\d+|[a-z]+')
+_DEPENDENCIES_RE = re.compile(r'"dependencies"\s*:\s*\[(.*?)\]', re.DOTALL | re.IGNORECASE)
+_QUOTED_VALUE_RE = re.compile(r'["\']([^"\']+)["\']')
+_MAJOR_VERSION_RE = re.compile(r'(?P<major>[\d.]+[a-z]?)')
 
+# In-memory cap for a 7z mod_info.json read; real files are a few KB
+MOD_INFO_MAX_SIZE = 1024 * 1024
+
+# Below this many mod folders, thread start-up costs more than the serial reads
+SCAN_PARALLEL_THRESHOLD = 16
+
+# id and version sit near the top of mod_info.json; dependency lists can make the rest large
+MOD_INFO_HEAD_SIZE = 8192
+
+
+@lru_cache(maxsize=4096)
 def normalize_mod_name(name: str) -> str:
     """Normalize mod name for comparison (remove spaces/hyphens/underscores, lowercase)."""
     if not name:
         return ''
-    return re.sub(r'[\s\-_]', '', str(name).lower())
+    return _NAME_SEPARATORS_RE.sub('', str(name).lower())
 
 
 def extract_mod_id_from_text(content: str) -> Optional[str]:
     """Extract mod ID. Handles \"id\": \"value\", id: \"value\", id:'value'."""
-    match = re.search(r'["\']?id["\']?\s*:\s*["\']([^"\']+)["\']', content, re.IGNORECASE)
+    match = _MOD_ID_RE.search(content)
     return match.group(1) if match else None
 
 
 def _extract_mod_name_from_text(content: str) -> Optional[str]:
-    match = re.search(r'["\']?name["\']?\s*:\s*["\']([^"\']+)["\']', content, re.IGNORECASE)
+    match = _MOD_NAME_RE.search(content)
     return match.group(1) if match else None
 
 
 def extract_mod_version_from_text(content: str) -> str:
     """Extract version. Handles {major/minor/patch} or \"1.5.0\" formats."""
-    version_block = re.search(r'"?version"?\s*:\s*\{([^}]+)\}', content, re.IGNORECASE)
+    version_block = _VERSION_BLOCK_RE.search(content)
     if version_block:
         block = version_block.group(1)
-        major = re.search(r'"?major"?\s*:\s*["\']?([0-9]+)', block, re.IGNORECASE)
-        minor = re.search(r'"?minor"?\s*:\s*["\']?([0-9]+)', block, re.IGNORECASE)
-        patch = re.search(r'"?patch"?\s*:\s*["\']?([0-9a-zA-Z]+)', block, re.IGNORECASE)
+        major = _MAJOR_RE.search(block)
+        minor = _MINOR_RE.search(block)
+        patch = _PATCH_RE.search(block)
         
         if major:
             parts = [major.group(1)]
@@ -56,7 +88,7 @@ def extract_mod_version_from_text(content: str) -> str:
                 parts.append(patch.group(1))
             return '.'.join(parts)
     
-    match = re.search(r'(?<!game)"?version"?\s*:\s*["\']?([0-9]+[0-9a-zA-Z._-]*)', content, re.IGNORECASE)
+    match = _VERSION_STRING_RE.search(content)
     if match:
         return match.group(1).rstrip('",}] ')
     
@@ -64,7 +96,7 @@ def extract_mod_version_from_text(content: str) -> str:
 
 
 def extract_game_version_from_text(content: str) -> Optional[str]:
-    match = re.search(r'"?gameVersion"?\s*:\s*["\']([^"\']+)["\']', content, re.IGNORECASE)
+    match = _GAME_VERSION_RE.search(content)
     return match.group(1) if match else None
 
 
@@ -89,6 +121,22 @@ def extract_all_metadata_from_text(content: str) -> Dict[str, Optional[str]]:
     }
 
 
+def read_mod_info_metadata(fileobj, extract=extract_all_metadata_from_text, required=None) -> Dict[str, Any]:
+    """Parse a binary mod_info.json stream with extract(text) -> dict of fields.
+    
+    The leading MOD_INFO_HEAD_SIZE bytes (cut at the last full line so a value is never
+    split mid-token) are parsed first; if every field in required (default: all of them)
+    is found there, that result is returned and the rest of the file is never read.
+    """
+    data = fileobj.read(MOD_INFO_HEAD_SIZE)
+    if len(data) == MOD_INFO_HEAD_SIZE:
+        fields = extract(data[:max(data.rfind(b'\n'), 0)].decode('utf-8'))
+        if all(fields.get(key) and fields[key] != 'unknown' for key in (required or fields)):
+            return fields
+    return extract((data + fileobj.read()).decode('utf-8'))
+
+
+@lru_cache(maxsize=4096)
 def compare_versions(version1: str, version2: str) -> int:
     """Compare semantic versions. Returns 1 if v1>v2, -1 if v1<v2, 0 if equal."""
     if version1 == version2:
@@ -96,13 +144,12 @@ def compare_versions(version1: str, version2: str) -> int:
     
     def parse_version(v):
         v = str(v).lower().replace('v', '').replace('version', '').strip()
-        parts = re.findall(r'\d+|[a-z]+', v)
+        parts = _VERSION_TOKEN_RE.findall(v)
         return [int(p) if p.isdigit() else ord(p[0]) - ord('a') + 1 for p in parts]
     
     v1_parts = parse_version(version1)
     v2_parts = parse_version(version2)
     
-    from itertools import zip_longest
     for p1, p2 in zip_longest(v1_parts, v2_parts, fillvalue=0):
         if p1 > p2:
             return 1
@@ -127,6 +174,24 @@ def is_mod_name_match(search_name: str, folder_name: str, installed_name: Option
     return normalized_search in folder_normalized or folder_normalized in normalized_search
 
 
+def _read_mod_info_file(folder_path: str) -> Optional[str]:
+    try:
+        # A missing mod_info.json surfaces as FileNotFoundError; no separate exists() probe
+        with open(os.path.join(folder_path, "mod_info.json"), 'r', encoding='utf-8') as f:
+            return f.read()
+    except (IOError, UnicodeDecodeError, PermissionError):
+        return None
+
+
+def _read_mod_info_files(folder_paths: List[str]) -> List[Optional[str]]:
+    """mod_info.json contents (None if unreadable) for each folder, in order."""
+    # File reads release the GIL, so large mod folders are read on a small thread pool
+    if len(folder_paths) >= SCAN_PARALLEL_THRESHOLD:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            return list(executor.map(_read_mod_info_file, folder_paths))
+    return [_read_mod_info_file(path) for path in folder_paths]
+
+
 def scan_installed_mods(mods_dir: Path, filter_func=None):
     """Scan mods directory and yield (folder_path, metadata_dict) for each valid mod.
     
@@ -139,39 +204,148 @@ def scan_installed_mods(mods_dir: Path, filter_func=None):
     if not mods_dir or not mods_dir.exists():
         return
     
-    for folder in mods_dir.iterdir():
-        if not folder.is_dir() or folder.name.startswith('.'):
+    # scandir reuses the directory entry type instead of stat-ing every folder
+    with os.scandir(mods_dir) as entries:
+        dirs = [entry.path for entry in entries if not entry.name.startswith('.') and entry.is_dir()]
+    
+    for path, content in zip(dirs, _read_mod_info_files(dirs)):
+        if content is None:
             continue
-        
-        mod_info_file = folder / "mod_info.json"
-        if not mod_info_file.exists():
+        folder = Path(path)
+        if filter_func and not filter_func(folder, content):
             continue
         
+        metadata = extract_all_metadata_from_text(content)
+        metadata['folder_name'] = folder.name
+        metadata['content'] = content
+        
+        yield folder, metadata
+
+
+def scan_installed_mods_cached(mods_dir: Path, cache_file: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+    """scan_installed_mods() that only re-reads mod_info.json files whose mtime/size changed.
+    
+    Parsed metadata is kept in cache_file (JSON) between runs, so an unchanged mods folder
+    costs one stat per mod instead of a read and parse.
+    """
+    if not mods_dir or not mods_dir.exists():
+        return []
+    
+    mods_dir_key = str(Path(mods_dir).resolve())
+    cached = {}
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('mods_dir') == mods_dir_key and isinstance(data.get('entries'), dict):
+            cached = data['entries']
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    with os.scandir(mods_dir) as entries:
+        dirs = [entry for entry in entries if not entry.name.startswith('.') and entry.is_dir()]
+    
+    signed = []
+    stale = []
+    for entry in dirs:
         try:
-            with open(mod_info_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if filter_func and not filter_func(folder, content):
+            stat = os.stat(os.path.join(entry.path, "mod_info.json"))
+        except OSError:
+            continue
+        signature = [stat.st_mtime_ns, stat.st_size]
+        hit = cached.get(entry.name)
+        # Entries of the wrong shape (hand-edited or truncated cache) count as changed
+        if not (isinstance(hit, dict) and hit.get('signature') == signature
+                and isinstance(hit.get('metadata'), dict)):
+            stale.append(entry.path)
+        signed.append((entry, signature))
+    
+    # Only changed mods are re-read, together on the scan's thread pool
+    contents = dict(zip(stale, _read_mod_info_files(stale)))
+    changed = bool(stale)
+    
+    results = []
+    fresh = {}
+    for entry, signature in signed:
+        if entry.path in contents:
+            content = contents[entry.path]
+            if content is None:
                 continue
-            
             metadata = extract_all_metadata_from_text(content)
-            metadata['folder_name'] = folder.name
+            metadata['folder_name'] = entry.name
             metadata['content'] = content
-            
-            yield folder, metadata
-        except (IOError, UnicodeDecodeError, PermissionError):
-            continue
+        else:
+            metadata = cached[entry.name]['metadata']
+        
+        fresh[entry.name] = {'signature': signature, 'metadata': metadata}
+        results.append((Path(entry.path), metadata))
+    
+    if changed or len(fresh) != len(cached):
+        try:
+            cache_path = Path(cache_file)
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_fd, temp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f'.tmp_{cache_path.stem}_',
+                                                  suffix='.json')
+            try:
+                with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                    json.dump({'mods_dir': mods_dir_key, 'entries': fresh}, f)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                os.unlink(temp_path)
+        except OSError:
+            pass
+    
+    return results
+
+
+class InstalledModIndex:
+    """scan_installed_mods() results indexed by mod id and normalized name."""
+    
+    def __init__(self, entries):
+        self.entries = list(entries)
+        self.by_id = {}
+        self.by_name = {}
+        self._casefolded = [None] * len(self.entries)
+        for entry in self.entries:
+            folder, metadata = entry
+            if mod_id := metadata.get('id'):
+                self.by_id.setdefault(mod_id, entry)
+            for name in (folder.name, metadata.get('name')):
+                if name:
+                    self.by_name.setdefault(normalize_mod_name(name), entry)
+    
+    def __iter__(self):
+        return iter(self.entries)
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def casefolded(self, position: int) -> Tuple[str, str]:
+        """Case-folded (folder name, mod_info.json text) of entries[position], computed once per scan."""
+        folded = self._casefolded[position]
+        if folded is None:
+            folder, metadata = self.entries[position]
+            folded = self._casefolded[position] = (folder.name.casefold(), metadata.get('content', '').casefold())
+        return folded
+    
+    def find(self, mod_name: str, mod_id: Optional[str] = None) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """Return (folder, metadata) for a mod; falls back to partial name matching on a miss."""
+        if mod_id and mod_id in self.by_id:
+            return self.by_id[mod_id]
+        entry = self.by_name.get(normalize_mod_name(mod_name))
+        if entry:
+            return entry
+        for folder, metadata in self.entries:
+            if is_mod_name_match(mod_name, folder.name, metadata.get('name', '')):
+                return folder, metadata
+        return None
 
 
 def extract_dependencies_from_text(content: str) -> List[str]:
     """Extract dependency mod IDs from mod_info.json."""
-    pattern = r'"dependencies"\s*:\s*\[(.*?)\]'
-    match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+    match = _DEPENDENCIES_RE.search(content)
     
     if match:
-        deps_str = match.group(1)
-        dep_pattern = r'["\']([^"\']+)["\']'
-        return re.findall(dep_pattern, deps_str)
+        return _QUOTED_VALUE_RE.findall(match.group(1))
     return []
 
 
@@ -194,22 +368,28 @@ def check_missing_dependencies(mod_list: List[Dict[str, Any]], installed_mod_ids
     return missing_deps
 
 
+@lru_cache(maxsize=4096)
 def extract_major_version(version_str: Optional[str]) -> Optional[str]:
     """Extract major version: '0.97a' from '0.97a-RC10'."""
     if not version_str:
         return None
-    match = re.match(r'([\d.]+[a-z]?)', version_str.split('-')[0])
-    return match.group(1) if match else version_str.split('-')[0]
+    # The pattern cannot cross '-', so matching the full string needs no split first
+    match = _MAJOR_VERSION_RE.match(version_str)
+    return match.group('major') if match else version_str.partition('-')[0]
 
 
-def is_mod_up_to_date(mod_name: str, expected_version: Optional[str], mods_dir: Path) -> ModVersionCheck:
-    """Check if installed mod version >= expected."""
+def is_mod_up_to_date(mod_name: str, expected_version: Optional[str], mods_dir: Path,
+                      installed_mods: Optional[InstalledModIndex] = None,
+                      mod_id: Optional[str] = None) -> ModVersionCheck:
+    """Check if installed mod version >= expected. Pass installed_mods to reuse an earlier scan."""
     installed_version = None
     
-    for folder, metadata in scan_installed_mods(mods_dir):
-        if is_mod_name_match(mod_name, folder.name, metadata.get('name', '')):
-            installed_version = metadata.get('version', 'unknown')
-            break
+    if installed_mods is None:
+        installed_mods = InstalledModIndex(scan_installed_mods(mods_dir))
+    
+    match = installed_mods.find(mod_name, mod_id)
+    if match:
+        installed_version = match[1].get('version', 'unknown')
     
     if not installed_version:
         return ModVersionCheck(False, None)
@@ -220,6 +400,9 @@ def is_mod_up_to_date(mod_name: str, expected_version: Optional[str], mods_dir:
     if installed_version == 'unknown':
         return ModVersionCheck(False, installed_version)
     
+    if installed_version == expected_version:
+        return ModVersionCheck(True, installed_version)
+    
     try:
         is_current = compare_versions(installed_version, expected_version) >= 0
         return ModVersionCheck(is_current, installed_version)
@@ -229,38 +412,54 @@ def is_mod_up_to_date(mod_name: str, expected_version: Optional[str], mods_dir:
 
 def resolve_mod_dependencies(mods: List[Dict[str, Any]], installed_mods_dict: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Topological sort: reorder mods so dependencies install first."""
-    mod_by_id = {mod.get('mod_id'): mod for mod in mods if mod.get('mod_id')}
-    mod_by_name = {normalize_mod_name(mod.get('name', '')): mod for mod in mods if mod.get('name')}
+    # Graph over list positions: no per-edge name hashing, and duplicate names stay distinct
+    index_by_id = {mod.get('mod_id'): i for i, mod in enumerate(mods) if mod.get('mod_id')}
+    index_by_name = {normalize_mod_name(mod.get('name', '')): i for i, mod in enumerate(mods) if mod.get('name')}
     
-    in_degree = {mod['name']: 0 for mod in mods}
-    adj_list = {mod['name']: [] for mod in mods}
+    n = len(mods)
+    in_degree = [0] * n
+    adj_list = [[] for _ in range(n)]
     
-    for mod in mods:
+    for i, mod in enumerate(mods):
         for dep in mod.get('dependencies', []):
-            dep_mod = mod_by_id.get(dep.get('id'))
-            if not dep_mod and dep.get('name'):
-                dep_mod = mod_by_name.get(normalize_mod_name(dep.get('name', '')))
+            dep_index = index_by_id.get(dep.get('id'))
+            if dep_index is None and dep.get('name'):
+                dep_index = index_by_name.get(normalize_mod_name(dep.get('name', '')))
             
-            if dep_mod and dep_mod['name'] not in installed_mods_dict:
-                adj_list[dep_mod['name']].append(mod['name'])
-                in_degree[mod['name']] += 1
+            if dep_index is not None and mods[dep_index]['name'] not in installed_mods_dict:
+                adj_list[dep_index].append(i)
+                in_degree[i] += 1
     
-    queue = [mod['name'] for mod in mods if in_degree[mod['name']] == 0]
-    sorted_names = []
+    queue = deque(i for i in range(n) if in_degree[i] == 0)
+    sorted_indices = []
     
     while queue:
-        current = queue.pop(0)
-        sorted_names.append(current)
+        current = queue.popleft()
+        sorted_indices.append(current)
         for neighbor in adj_list[current]:
             in_degree[neighbor] -= 1
             if in_degree[neighbor] == 0:
                 queue.append(neighbor)
     
-    if len(sorted_names) != len(mods):
+    if len(sorted_indices) != n:
         return mods
     
-    name_to_mod = {mod['name']: mod for mod in mods}
-    return [name_to_mod[name] for name in sorted_names]
+    return [mods[i] for i in sorted_indices]
+
+
+def find_mod_info_member(names: List[str], lookup=None) -> Optional[str]:
+    """Return the shallowest mod_info.json in an archive listing (exact file name only).
+    
+    With lookup (a name-keyed mapping such as ZipFile.NameToInfo), the two canonical
+    locations are tried first and the listing is only scanned if neither exists.
+    """
+    if lookup is not None and names:
+        top = names[0].partition('/')[0]
+        for candidate in ('mod_info.json', f'{top}/mod_info.json'):
+            if candidate in lookup:
+                return candidate
+    candidates = (name for name in names if name == 'mod_info.json' or name.endswith('/mod_info.json'))
+    return min(candidates, key=lambda name: name.count('/'), default=None)
 
 
 def read_mod_info_from_archive(archive_path: Path, is_7z: bool = False) -> Optional[Dict[str, Any]]:
@@ -273,18 +472,41 @@ def read_mod_info_from_archive(archive_path: Path, is_7z: bool = False) -> Optio
                 return None
             
             with py7zr.SevenZipFile(archive_path, 'r') as archive:
-                for member in archive.getnames():
-                    if member.endswith('mod_info.json'):
-                        with tempfile.TemporaryDirectory() as tmpdir:
-                            archive.extract(path=tmpdir, targets=[member])
-                            with open(Path(tmpdir) / member, 'r', encoding='utf-8') as f:
-                                return extract_all_metadata_from_text(f.read())
+                return read_mod_info_from_open_archive(archive, is_7z)
         else:
             with zipfile.ZipFile(archive_path, 'r') as archive:
-                for member in archive.namelist():
-                    if member.endswith('mod_info.json'):
-                        with archive.open(member) as f:
-                            return extract_all_metadata_from_text(f.read().decode('utf-8'))
+                return read_mod_info_from_open_archive(archive, is_7z)
+    except Exception:
+        pass
+    return None
+
+
+def _read_7z_member(archive, member: str) -> bytes:
+    """Decompress one (small) 7z member into memory."""
+    if hasattr(archive, 'read'):
+        # py7zr < 1.0
+        return archive.read(targets=[member])[member].read()
+    from py7zr.io import BytesIOFactory
+    factory = BytesIOFactory(limit=MOD_INFO_MAX_SIZE)
+    archive.extract(targets=[member], factory=factory)
+    product = factory.get(member)
+    product.seek(0)
+    return product.read()
+
+
+def read_mod_info_from_open_archive(archive, is_7z: bool = False) -> Optional[Dict[str, Any]]:
+    """Like read_mod_info_from_archive(), on an already-open ZipFile/SevenZipFile."""
+    try:
+        if is_7z:
+            member = find_mod_info_member(archive.getnames())
+            if member:
+                # mod_info.json is tiny: read it in memory instead of a temp-dir round trip
+                return extract_all_metadata_from_text(_read_7z_member(archive, member).decode('utf-8'))
+        else:
+            member = find_mod_info_member(archive.namelist(), archive.NameToInfo)
+            if member:
+                with archive.open(member) as f:
+                    return read_mod_info_metadata(f)
     except Exception:
         pass
     return None
@@ -311,20 +533,22 @@ def refresh_mod_metadata(modlist_data, mods_dir, log_callback=None):
     
     log("Reloading modlist configuration...")
     
+    # One scan, indexed by normalized name, instead of a full scan per modlist entry
+    installed_mods = InstalledModIndex(scan_installed_mods(mods_dir))
     updated_count = 0
     for mod in modlist_data.get('mods', []):
         mod_name = mod.get('name', '')
         if not mod_name:
             continue
         
-        for folder, metadata in scan_installed_mods(mods_dir):
-            if is_mod_name_match(mod_name, folder.name, metadata.get('name', '')):
-                if metadata.get('version') and metadata['version'] != 'unknown':
-                    mod['mod_version'] = metadata['version']
-                    updated_count += 1
-                if metadata.get('gameVersion'):
-                    mod['game_version'] = metadata['gameVersion']
-                break
+        match = installed_mods.find(mod_name)
+        if match:
+            metadata = match[1]
+            if metadata.get('version') and metadata['version'] != 'unknown':
+                mod['mod_version'] = metadata['version']
+                updated_count += 1
+            if metadata.get('gameVersion'):
+                mod['game_version'] = metadata['gameVersion']
     
     return (updated_count, None)
 
@@ -399,6 +623,7 @@ def enable_all_installed_mods(mods_dir, mod_installer, log_callback=None):
         return (0, "No mods found in mods directory")
     
     # Update enabled_mods.json with all installed mods
+    mod_installer.invalidate_installed_cache()
     success = mod_installer.update_enabled_mods(mods_dir, all_installed_folders, merge=False)
     
     if success:
@@ -448,6 +673,7 @@ def enable_modlist_mods(mods_dir, mod_installer, modlist_data, log_callback=None
         return (0, "No matching mods from modlist are installed")
     
     # Update enabled_mods.json with only selected mods (no merge)
+    mod_installer.invalidate_installed_cache()
     success = mod_installer.update_enabled_mods(mods_dir, selected_folders, merge=False)
     if success:
         log(f"{LogSymbols.SUCCESS} Enabled {len(selected_folders)} mod(s) from modlist in enabled_mods.json")
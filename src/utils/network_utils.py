@@ -1,13 +1,101 @@
 import requests
 import time
+import random
+import os
+import json
+import tempfile
+import queue
+import threading
 import concurrent.futures
-from urllib.parse import urlparse
+from urllib.parse import unquote
 import re
+from functools import partial
+from itertools import zip_longest
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Longest Retry-After the download session will sleep for; the adapter's wait can't be canceled
+MAX_RETRY_AFTER = 30
+
+
+class _CappedRetry(Retry):
+    """Retry whose Retry-After sleep is capped at max_retry_after seconds.
+    
+    urllib3 otherwise sleeps for as long as the server asks (up to hours), inside a
+    call the Cancel button cannot interrupt.
+    """
+    def __init__(self, *args, max_retry_after=MAX_RETRY_AFTER, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+    
+    def new(self, **kwargs):
+        # urllib3 builds a fresh Retry after every attempt; carry the cap over
+        retry = super().new(**kwargs)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_retry_after)
+
+
+def create_session(pool_maxsize=32, retries=3, backoff_factor=0.5, max_retry_after=MAX_RETRY_AFTER):
+    """Create a requests.Session with large keep-alive pools for HTTP(S) hosts.
+    
+    Connection errors and 429/5xx answers to GET/HEAD are retried inside the adapter,
+    on the pooled connection. Retry-After is honoured up to max_retry_after seconds;
+    with max_retry_after=0 it is ignored and only backoff_factor applies.
+    """
+    session = requests.Session()
+    retry = _CappedRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({'HEAD', 'GET'}),
+        raise_on_status=False,
+        respect_retry_after_header=max_retry_after > 0,
+        max_retry_after=max_retry_after,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': 'Starsector-Modlist-Installer',
+        # Archives are already compressed; avoid a second decode pass on the stream
+        'Accept-Encoding': 'identity',
+    })
+    return session
+
+
+# Shared by downloads so retries to the same host reuse TLS connections
+SESSION = create_session()
+
+# URL probes fail fast: one retry, no backoff or Retry-After sleeps, so a dead or
+# rate-limiting host costs ~one timeout
+PROBE_SESSION = create_session(retries=1, backoff_factor=0, max_retry_after=0)
+
+# Minimum gap between URL-check progress callbacks; each one is a GUI event round-trip
+PROGRESS_INTERVAL = 0.05
+
+
+def get_session():
+    """Return the shared HTTP session."""
+    return SESSION
+
+
+def get_probe_session():
+    """Return the shared fail-fast session used for URL checks."""
+    return PROBE_SESSION
 
 
 def retry_with_backoff(func, max_retries=3, delay=1, backoff=2, 
-                       exceptions=(requests.exceptions.RequestException,)):
-    """Retry function with exponential backoff."""
+                       exceptions=(requests.exceptions.RequestException,), jitter=True):
+    """Retry function with exponential backoff.
+    
+    With jitter, each wait is scaled by a random factor in [0.5, 1.5) so parallel
+    downloads that failed together don't retry in lockstep.
+    """
     last_exception = None
     current_delay = delay
     
@@ -17,14 +105,195 @@ def retry_with_backoff(func, max_retries=3, delay=1, backoff=2,
         except exceptions as e:
             last_exception = e
             if attempt < max_retries - 1:
-                time.sleep(current_delay)
+                time.sleep(current_delay * random.uniform(0.5, 1.5) if jitter else current_delay)
                 current_delay *= backoff
     
     raise last_exception
 
 
-def validate_mod_urls(mods, progress_callback=None, timeout=3, max_workers=10):
-    """Validate URLs in parallel, categorize by domain (github/gdrive/mediafire/other/failed)."""
+_GITHUB_HOSTS = frozenset({'github.com', 'api.github.com', 'objects.githubusercontent.com'})
+_GDRIVE_HOSTS = frozenset({'drive.google.com', 'drive.usercontent.google.com', 'docs.google.com'})
+
+
+# The authority part of an absolute URL, i.e. urlparse(url).netloc without the full parse
+_NETLOC_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*://([^/?#]*)')
+
+
+def _classify_url(url):
+    """Return (category, domain) for a download URL from its host alone."""
+    match = _NETLOC_RE.match(url) if isinstance(url, str) else None
+    domain = match.group(1).lower() if match else 'unknown'
+    
+    # Exact host/suffix matching: substring checks would also accept e.g. notgithub.com
+    host = domain.rpartition('@')[2].split(':', 1)[0]
+    if host in _GITHUB_HOSTS or host.endswith('.github.com'):
+        return 'github', domain
+    if host in _GDRIVE_HOSTS:
+        return 'google_drive', domain
+    if host == 'mediafire.com' or host.endswith('.mediafire.com'):
+        return 'mediafire', domain
+    return 'other', domain
+
+
+_GITHUB_RELEASE_ASSET_RE = re.compile(
+    r'^https?://github\.com/([^/]+/[^/]+)/releases/download/([^/]+)/([^/?#]+)', re.IGNORECASE)
+# Successful lookups live this long; failures are never cached
+GITHUB_RELEASE_CACHE_TTL = 3600
+# Used when a 403/429 carries neither Retry-After nor X-RateLimit-Reset
+GITHUB_RATE_LIMIT_BACKOFF = 900
+# (repo, tag) -> (fetched_at, set of asset names)
+_github_release_assets = {}
+_github_release_locks = {}
+_github_release_guard = threading.Lock()
+# The unauthenticated API allows 60 calls/hour; once refused, skip it until this time
+_github_api_blocked_until = 0.0
+
+
+def _github_rate_limit_reset(response):
+    """Epoch seconds at which a 403/429 from the GitHub API may be retried."""
+    now = time.time()
+    try:
+        return now + float(response.headers['Retry-After'])
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return max(now, float(response.headers['X-RateLimit-Reset']))
+    except (KeyError, TypeError, ValueError):
+        return now + GITHUB_RATE_LIMIT_BACKOFF
+
+
+def _github_release_has_asset(url, session, timeout):
+    """True if url is a GitHub release asset listed by the releases API.
+    
+    One API call per (repo, tag) covers every asset of that release; None means the URL
+    isn't a listed asset or the lookup failed, and the caller should probe it normally.
+    Only successful lookups are cached; a 403/429 (rate limit) stops API calls until reset.
+    """
+    global _github_api_blocked_until
+    match = _GITHUB_RELEASE_ASSET_RE.match(url)
+    if not match:
+        return None
+    repo, tag, asset = match.groups()
+    key = (repo.lower(), tag)
+    with _github_release_guard:
+        lock = _github_release_locks.setdefault(key, threading.Lock())
+    with lock:
+        cached = _github_release_assets.get(key)
+        if cached and time.time() - cached[0] < GITHUB_RELEASE_CACHE_TTL:
+            assets = cached[1]
+        elif time.time() < _github_api_blocked_until:
+            return None
+        else:
+            try:
+                response = session.get(f'https://api.github.com/repos/{repo}/releases/tags/{tag}',
+                                       timeout=timeout, headers={'Accept': 'application/vnd.github+json'})
+                if response.status_code in (403, 429):
+                    _github_api_blocked_until = _github_rate_limit_reset(response)
+                    return None
+                if response.status_code != 200:
+                    return None
+                assets = {item.get('name') for item in response.json().get('assets', [])}
+            except (requests.exceptions.RequestException, ValueError, AttributeError, TypeError):
+                return None
+            _github_release_assets[key] = (time.time(), assets)
+    return unquote(asset) in assets or None
+
+
+def _trunc(text, limit=50):
+    """text, cut to limit characters with a trailing '...' if longer."""
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+
+def _check_url(mod, index, session, timeout):
+    """Check a single URL. Returns (index, category, mod, domain, status, error)."""
+    url = mod.get('download_url', '')
+    if not url:
+        return (index, 'failed', mod, None, 0, 'No download URL')
+    
+    category, domain = _classify_url(url)
+    
+    try:
+        # Listed release assets need no HEAD/redirect round trip of their own
+        if category == 'github' and _github_release_has_asset(url, session, timeout):
+            return (index, category, mod, domain, 200, None)
+        try:
+            response = session.head(url, timeout=timeout, allow_redirects=True)
+            if response.status_code == 403:
+                raise requests.exceptions.RequestException("HEAD blocked, trying GET")
+        except (requests.exceptions.RequestException, requests.exceptions.Timeout):
+            response = session.get(url, timeout=timeout, allow_redirects=True, 
+                                  headers={'Range': 'bytes=0-0'}, stream=True)
+            response.close()
+        
+        if not (200 <= response.status_code < 300):
+            return (index, 'failed', mod, domain, response.status_code, f'HTTP {response.status_code}')
+        return (index, category, mod, domain, response.status_code, None)
+    except requests.exceptions.Timeout:
+        return (index, 'failed', mod, domain, 0, 'Timeout (3s)')
+    except requests.exceptions.RequestException as e:
+        return (index, 'failed', mod, domain, 0, _trunc(str(e)))
+
+
+def _check_lane(lane, check_url, results_queue):
+    """Probe one host's URLs back to back so they reuse a single keep-alive connection."""
+    for index, mod in lane:
+        try:
+            result = check_url(mod, index)
+        except Exception as e:
+            # Never leave the collector waiting for a result that won't come
+            result = (index, 'failed', mod, None, 0, str(e))
+        results_queue.put(result)
+
+
+_CACHEABLE_CATEGORIES = frozenset({'github', 'google_drive', 'mediafire', 'other'})
+
+
+def _is_valid_cache_entry(entry):
+    """True if entry has the shape record_probe writes; anything else is discarded on load."""
+    return (isinstance(entry, dict)
+            and entry.get('category') in _CACHEABLE_CATEGORIES
+            and isinstance(entry.get('ts'), (int, float))
+            and isinstance(entry.get('status'), int)
+            and (entry.get('domain') is None or isinstance(entry.get('domain'), str)))
+
+
+def _load_validation_cache(cache_path, ttl):
+    """Return {url: entry} for well-formed cached successful probes younger than ttl seconds."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(entries, dict):
+        return {}
+    now = time.time()
+    return {url: entry for url, entry in entries.items()
+            if _is_valid_cache_entry(entry) and now - entry['ts'] < ttl}
+
+
+def _save_validation_cache(cache_path, cache):
+    """Atomic write: temp file + replace so a crash never leaves a truncated cache."""
+    cache_path = os.fspath(cache_path)
+    try:
+        temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.',
+                                              prefix='.tmp_url_cache_', suffix='.json')
+        try:
+            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            os.unlink(temp_path)
+    except OSError:
+        pass
+
+
+def validate_mod_urls(mods, progress_callback=None, timeout=3, max_workers=10, session=None,
+                      validate_reachability=True, per_host_limit=4, cache_path=None, cache_ttl=86400):
+    """Validate URLs in parallel, categorize by domain (github/gdrive/mediafire/other/failed).
+    
+    With validate_reachability=False, mods are only categorized from their URL (no requests).
+    With cache_path, URLs that answered 2xx within cache_ttl seconds are not probed again.
+    """
     results = {
         'github': [],
         'google_drive': [],
@@ -33,117 +302,91 @@ def validate_mod_urls(mods, progress_callback=None, timeout=3, max_workers=10):
         'failed': []
     }
     
-    def check_url(mod, index):
-        """Check a single URL. Returns (index, category, mod, domain, status, error)."""
-        if progress_callback:
-            progress_callback(index + 1, len(mods), mod.get('name', 'Unknown'))
-        
+    def record(result):
+        index, category, mod, domain, status, error = result
+        if category == 'github':
+            results['github'].append(mod)
+        elif category == 'google_drive':
+            results['google_drive'].append(mod)
+        elif category == 'mediafire':
+            results['mediafire'].append(mod)
+        elif category == 'other':
+            if domain not in results['other']:
+                results['other'][domain] = []
+            results['other'][domain].append(mod)
+        elif category == 'failed':
+            results['failed'].append({
+                'mod': mod,
+                'status': status,
+                'error': error
+            })
+    
+    cache = _load_validation_cache(cache_path, cache_ttl) if cache_path and validate_reachability else None
+    
+    def record_probe(result):
+        record(result)
+        if cache is not None:
+            index, category, mod, domain, status, error = result
+            url = mod.get('download_url')
+            if category == 'failed':
+                cache.pop(url, None)
+            else:
+                cache[url] = {'status': status, 'category': category, 'domain': domain, 'ts': time.time()}
+    
+    # Group by host up front: categories are known without any request
+    host_groups = {}
+    for i, mod in enumerate(mods):
         url = mod.get('download_url', '')
         if not url:
-            return (index, 'failed', mod, None, 0, 'No download URL')
-        
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-        except (ValueError, AttributeError):
-            domain = 'unknown'
-        
-        is_github = 'github.com' in domain
-        is_gdrive = 'drive.google.com' in domain or 'drive.usercontent.google.com' in domain
-        is_mediafire = 'mediafire.com' in domain
-        
-        try:
-            try:
-                response = requests.head(url, timeout=timeout, allow_redirects=True)
-                if response.status_code == 403:
-                    raise requests.exceptions.RequestException("HEAD blocked, trying GET")
-            except (requests.exceptions.RequestException, requests.exceptions.Timeout):
-                response = requests.get(url, timeout=timeout, allow_redirects=True, 
-                                       headers={'Range': 'bytes=0-0'}, stream=True)
-                response.close()
-            
-            # Early return: non-success status
-            if not (200 <= response.status_code < 300):
-                return (index, 'failed', mod, domain, response.status_code, f'HTTP {response.status_code}')
-            
-            # Success: categorize by domain
-            if is_github:
-                return (index, 'github', mod, domain, response.status_code, None)
-            if is_gdrive:
-                return (index, 'google_drive', mod, domain, response.status_code, None)
-            if is_mediafire:
-                return (index, 'mediafire', mod, domain, response.status_code, None)
-            return (index, 'other', mod, domain, response.status_code, None)
-        except requests.exceptions.Timeout:
-            return (index, 'failed', mod, domain, 0, 'Timeout (3s)')
-        except requests.exceptions.RequestException as e:
-            error_msg = str(e)
-            if len(error_msg) > 50:
-                error_msg = error_msg[:47] + '...'
-            return (index, 'failed', mod, domain, 0, error_msg)
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(check_url, mod, i) for i, mod in enumerate(mods)]
-        
-        for future in concurrent.futures.as_completed(futures):
-            index, category, mod, domain, status, error = future.result()
-            
-            if category == 'github':
-                results['github'].append(mod)
-            elif category == 'google_drive':
-                results['google_drive'].append(mod)
-            elif category == 'mediafire':
-                results['mediafire'].append(mod)
-            elif category == 'other':
-                if domain not in results['other']:
-                    results['other'][domain] = []
-                results['other'][domain].append(mod)
-            elif category == 'failed':
-                results['failed'].append({
-                    'mod': mod,
-                    'status': status,
-                    'error': error
-                })
-    
-    if results['failed']:
-        retry_candidates = []
-        permanent_failures = []
-        
-        for fail in results['failed']:
-            if fail['status'] == 0:
-                retry_candidates.append(fail)
-            else:
-                permanent_failures.append(fail)
-        
-        if retry_candidates:
+            record((i, 'failed', mod, None, 0, 'No download URL'))
+            continue
+        if cache and url in cache:
+            entry = cache[url]
+            record((i, entry['category'], mod, entry['domain'], entry['status'], None))
+            continue
+        category, domain = _classify_url(url)
+        if not validate_reachability:
+            record((i, category, mod, domain, None, None))
+            continue
+        host_groups.setdefault(domain, []).append((i, mod))
+    
+    # Progress counts every mod; cache hits and mods without a probe are already done
+    total = len(mods)
+    if not host_groups:
+        if progress_callback and mods:
+            progress_callback(total, total, mods[-1].get('name', 'Unknown'))
+        return results
+    
+    # Each host's URLs are split into at most per_host_limit serial lanes: a lane keeps one
+    # connection busy instead of a handshake per URL, and the cap avoids tripping rate limits.
+    # Lanes are interleaved across hosts so every host starts early.
+    host_lanes = []
+    for group in host_groups.values():
+        count = max(1, min(per_host_limit, len(group)))
+        host_lanes.append([group[k::count] for k in range(count)])
+    lanes = [lane for batch in zip_longest(*host_lanes) for lane in batch if lane]
+    probed = sum(len(group) for group in host_groups.values())
+    check_url = partial(_check_url, session=session or get_probe_session(), timeout=timeout)
+    
+    # Transient failures are retried by the session's adapter; never spawn idle threads
+    results_queue = queue.SimpleQueue()
+    workers = max(1, min(max_workers, len(lanes)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for lane in lanes:
+            executor.submit(_check_lane, lane, check_url, results_queue)
+        last_progress = 0.0
+        for completed in range(total - probed + 1, total + 1):
+            result = results_queue.get()
             if progress_callback:
-                progress_callback(len(mods), len(mods), f"Retrying {len(retry_candidates)} failed...")
-            
-            results['failed'] = permanent_failures
-            
-            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-                retry_futures = [executor.submit(check_url, fail['mod'], i) 
-                                for i, fail in enumerate(retry_candidates)]
-                
-                for future in concurrent.futures.as_completed(retry_futures):
-                    index, category, mod, domain, status, error = future.result()
-                    
-                    if category == 'github':
-                        results['github'].append(mod)
-                    elif category == 'google_drive':
-                        results['google_drive'].append(mod)
-                    elif category == 'mediafire':
-                        results['mediafire'].append(mod)
-                    elif category == 'other':
-                        if domain not in results['other']:
-                            results['other'][domain] = []
-                        results['other'][domain].append(mod)
-                    elif category == 'failed':
-                        results['failed'].append({
-                            'mod': mod,
-                            'status': status,
-                            'error': error
-                        })
+                # Throttled, but the final completion is always reported
+                now = time.monotonic()
+                if completed == total or now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    progress_callback(completed, total, result[2].get('name', 'Unknown'))
+            record_probe(result)
+    
+    if cache is not None:
+        _save_validation_cache(cache_path, cache)
     
     return results
 
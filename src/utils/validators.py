@@ -1,13 +1,13 @@
 """Validation utilities: URLs and Starsector installation paths."""
 
 import time
-import requests
 import platform
 import shutil
 from pathlib import Path
 from typing import Optional, Union, Tuple
 
 from core.constants import URL_VALIDATION_TIMEOUT_HEAD, CACHE_TIMEOUT
+from utils.network_utils import get_probe_session
 
 
 # ============================================================================
@@ -17,9 +17,14 @@ from core.constants import URL_VALIDATION_TIMEOUT_HEAD, CACHE_TIMEOUT
 class URLValidator:
     """URL validator with built-in caching to avoid redundant network requests."""
     
-    def __init__(self):
-        """Initialize validator with empty cache."""
+    def __init__(self, session=None):
+        """Initialize validator with empty cache.
+        
+        Args:
+            session: requests.Session to probe with (default: the shared fail-fast probe session)
+        """
         self._cache = {}
+        self.session = session or get_probe_session()
     
     def _is_cached(self, url: str) -> tuple[bool, bool | None]:
         """Check if URL validation result is cached and still valid.
@@ -64,11 +69,13 @@ class URLValidator:
                 return is_valid
         
         try:
-            resp = requests.head(url, timeout=URL_VALIDATION_TIMEOUT_HEAD, allow_redirects=True)
+            resp = self.session.head(url, timeout=URL_VALIDATION_TIMEOUT_HEAD, allow_redirects=True)
             if 200 <= resp.status_code < 400:
                 result = True
             else:
-                resp = requests.get(url, stream=True, timeout=URL_VALIDATION_TIMEOUT_HEAD, allow_redirects=True)
+                resp = self.session.get(url, stream=True, timeout=URL_VALIDATION_TIMEOUT_HEAD, allow_redirects=True)
+                # Hand the socket back to the pool without reading the body
+                resp.close()
                 result = 200 <= resp.status_code < 400
             
             self._cache_result(url, result)
@@ -10,6 +10,7 @@ import io
 import zipfile
 import tempfile
 import shutil
+import time
 import tkinter as tk
 import requests
 from pathlib import Path
@@ -23,7 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from src.core.config_manager import ConfigManager
 from src.core.installer import ModInstaller
-from src.utils.network_utils import validate_mod_urls
+from src.utils.network_utils import validate_mod_urls, PROBE_SESSION
 from src.gui.dialogs import fix_google_drive_url
 from model_types import BackupResult
 
@@ -37,14 +38,20 @@ def mock_tkinter_windows():
     """Mock Tkinter window creation globally for all tests."""
     original_tk = tk.Tk
     original_toplevel = tk.Toplevel
+    # A display-less Tcl interpreter, so tk.BooleanVar etc. work on the mock windows
+    interpreter = tk.Tcl()
     
     class MockTk:
         def __init__(self, *args, **kwargs):
+            self.tk = interpreter.tk
+            self.children = {}
             self.title_text = ""
             self.attributes = {}
             self.geometry_str = ""
             self._destroyed = False
+            self._mapped = True
             self._bindings = {}
+            self._protocols = {}
             self._width = 800
             self._height = 600
             self._x = 100
@@ -56,11 +63,14 @@ def mock_tkinter_windows():
         def geometry(self, geom):
             self.geometry_str = geom
             
+        def _root(self):
+            return self
+            
         def withdraw(self):
-            pass
+            self._mapped = False
             
         def deiconify(self):
-            pass
+            self._mapped = True
             
         def destroy(self):
             self._destroyed = True
@@ -68,6 +78,18 @@ def mock_tkinter_windows():
         def winfo_exists(self):
             return not self._destroyed
             
+        def winfo_ismapped(self):
+            return self._mapped and not self._destroyed
+            
+        def winfo_children(self):
+            return list(self.children.values())
+            
+        def winfo_reqwidth(self):
+            return self._width
+            
+        def winfo_reqheight(self):
+            return self._height
+            
         def winfo_width(self):
             """Mock window width."""
             return self._width
@@ -97,10 +119,11 @@ def mock_tkinter_windows():
             pass
             
         def bind(self, sequence, func, add=None):
-            """Mock bind method for event handling."""
+            """Mock bind method for event handling; returns a funcid like Tk."""
             self._bindings[sequence] = func
+            return f"{id(func)}{sequence}"
             
-        def unbind(self, sequence):
+        def unbind(self, sequence, funcid=None):
             """Mock unbind method."""
             if sequence in self._bindings:
                 del self._bindings[sequence]
@@ -117,7 +140,7 @@ def mock_tkinter_windows():
             
         def protocol(self, name, func):
             """Mock protocol method for WM_DELETE_WINDOW etc."""
-            pass
+            self._protocols[name] = func
             
         def resizable(self, width, height):
             """Mock resizable."""
@@ -151,9 +174,18 @@ def mock_tkinter_windows():
             
         def wait_window(self, window=None):
             pass
+            
+        def wait_visibility(self, window=None):
+            pass
+            
+        def wait_variable(self, name='PY_VAR'):
+            """Nobody can click in tests: press Return so a modal dialog returns its default."""
+            self._bindings["<Return>"](None)
     
+    # Named fonts need Tk proper; dialogs only pass them on to (mocked) widgets
     with patch('tkinter.Tk', MockTk), \
-         patch('tkinter.Toplevel', MockToplevel):
+         patch('tkinter.Toplevel', MockToplevel), \
+         patch('tkinter.font.Font'):
         yield
     
     # Restore originals (though not necessary with pytest)
@@ -850,7 +882,7 @@ def test_extract_zip_success(tmp_path, monkeypatch):
             yield zip_bytes
         def raise_for_status(self):
             return None
-    monkeypatch.setattr("src.core.installer.requests.get", lambda url, stream=True, timeout=30: FakeResp())
+    monkeypatch.setattr("src.core.installer.get_session", lambda: Mock(get=lambda url, **kwargs: FakeResp()))
 
     logs = Logger()
     installer = ModInstaller(logs)
@@ -877,7 +909,7 @@ def test_zip_slip_blocked(tmp_path, monkeypatch):
             yield zip_bytes
         def raise_for_status(self):
             return None
-    monkeypatch.setattr("src.core.installer.requests.get", lambda url, stream=True, timeout=30: FakeResp())
+    monkeypatch.setattr("src.core.installer.get_session", lambda: Mock(get=lambda url, **kwargs: FakeResp()))
 
     logs = Logger()
     installer = ModInstaller(logs)
@@ -896,7 +928,7 @@ def test_network_error(tmp_path, monkeypatch):
     class FakeResp:
         def raise_for_status(self):
             raise Exception("Network down")
-    monkeypatch.setattr("src.core.installer.requests.get", lambda url, stream=True, timeout=30: FakeResp())
+    monkeypatch.setattr("src.core.installer.get_session", lambda: Mock(get=lambda url, **kwargs: FakeResp()))
 
     logs = Logger()
     installer = ModInstaller(logs)
@@ -919,7 +951,7 @@ def test_already_installed_single_root(tmp_path, monkeypatch):
             yield zip_bytes
         def raise_for_status(self):
             return None
-    monkeypatch.setattr("src.core.installer.requests.get", lambda url, stream=True, timeout=30: FakeResp())
+    monkeypatch.setattr("src.core.installer.get_session", lambda: Mock(get=lambda url, **kwargs: FakeResp()))
 
     logs = Logger()
     installer = ModInstaller(logs)
@@ -942,7 +974,7 @@ def test_overlap_at_root(tmp_path, monkeypatch):
             yield zip_bytes
         def raise_for_status(self):
             return None
-    monkeypatch.setattr("src.core.installer.requests.get", lambda url, stream=True, timeout=30: FakeResp())
+    monkeypatch.setattr("src.core.installer.get_session", lambda: Mock(get=lambda url, **kwargs: FakeResp()))
 
     logs = Logger()
     installer = ModInstaller(logs)
@@ -979,7 +1011,7 @@ def test_extract_7z_if_available(tmp_path, monkeypatch):
             yield data
         def raise_for_status(self):
             return None
-    monkeypatch.setattr("src.core.installer.requests.get", lambda url, stream=True, timeout=30: FakeResp())
+    monkeypatch.setattr("src.core.installer.get_session", lambda: Mock(get=lambda url, **kwargs: FakeResp()))
 
     logs = Logger()
     installer = ModInstaller(logs)
@@ -988,6 +1020,188 @@ def test_extract_7z_if_available(tmp_path, monkeypatch):
     ok = installer.install_mod({"name": "SevenZ", "download_url": "http://example.com/mod.7z"}, mods_dir)
     assert ok is True
     assert (mods_dir / "TestMod").exists()
+
+
+def test_zip_member_names_sanitised_for_windows(tmp_path, monkeypatch):
+    """Member names Windows cannot store are rewritten like zipfile.extract() does there."""
+    from src.core import archive_extractor
+    monkeypatch.setattr(archive_extractor, "_WINDOWS_NAMES", True)
+
+    archive_path = tmp_path / "mod.zip"
+    archive_path.write_bytes(make_in_memory_zip({
+        "TestMod/mod_info.json": "{}",
+        "TestMod/what?.txt": "question",
+        "TestMod/a:b*c|d.txt": "colon",
+        "TestMod/notes. ": "trailing",
+        "TestMod/dir./inner.txt": "nested",
+    }))
+    mods_dir = tmp_path / "mods"
+    mods_dir.mkdir()
+
+    extractor = archive_extractor.ArchiveExtractor(Mock())
+    assert extractor.extract_archive(archive_path, mods_dir, False) is True
+    mod_root = mods_dir / "TestMod"
+    assert (mod_root / "what_.txt").read_text() == "question"
+    assert (mod_root / "a_b_c_d.txt").read_text() == "colon"
+    assert (mod_root / "notes").read_text() == "trailing"
+    assert (mod_root / "dir" / "inner.txt").read_text() == "nested"
+
+
+def _assert_nothing_extracted(tmp_path, mods_dir):
+    assert not any(mods_dir.iterdir())
+    assert not list(tmp_path.rglob("zipslip_probe*"))
+    assert not Path("/zipslip_probe.txt").exists()
+
+
+@pytest.mark.parametrize("evil_name", [
+    "../zipslip_probe.txt",
+    "/zipslip_probe.txt",
+    "C:\\zipslip_probe.txt",
+    "..\\zipslip_probe.txt",
+    "TestMod/../../zipslip_probe.txt",
+], ids=["dotdot", "absolute", "drive-letter", "backslash-dotdot", "nested-dotdot"])
+def test_safe_members_rejects_unsafe_zip_paths(tmp_path, evil_name):
+    from src.core.archive_extractor import ArchiveExtractor
+    archive_path = tmp_path / "evil.zip"
+    archive_path.write_bytes(make_in_memory_zip({
+        "TestMod/mod_info.json": "{}",
+        evil_name: "boom",
+    }))
+    mods_dir = tmp_path / "game" / "mods"
+    mods_dir.mkdir(parents=True)
+
+    extractor = ArchiveExtractor(Mock())
+    with zipfile.ZipFile(archive_path) as zf:
+        assert extractor._safe_members(zf.infolist(), mods_dir) is None
+    assert extractor.extract_archive(archive_path, mods_dir, False) is False
+    _assert_nothing_extracted(tmp_path, mods_dir)
+
+
+def test_safe_members_rejects_zip_symlink_member(tmp_path):
+    import stat
+    from src.core.archive_extractor import ArchiveExtractor
+    link = zipfile.ZipInfo("TestMod/zipslip_probe_link")
+    link.external_attr = (stat.S_IFLNK | 0o777) << 16
+    archive_path = tmp_path / "symlink.zip"
+    with zipfile.ZipFile(archive_path, "w") as zf:
+        zf.writestr("TestMod/mod_info.json", "{}")
+        zf.writestr(link, "../../zipslip_probe.txt")
+    mods_dir = tmp_path / "game" / "mods"
+    mods_dir.mkdir(parents=True)
+
+    extractor = ArchiveExtractor(Mock())
+    assert extractor.extract_archive(archive_path, mods_dir, False) is False
+    _assert_nothing_extracted(tmp_path, mods_dir)
+
+
+def test_safe_members_rejects_7z_symlink_member(tmp_path):
+    from src.core import archive_extractor
+    if not archive_extractor.HAS_7ZIP:
+        pytest.skip("py7zr not available")
+    import py7zr
+    source = tmp_path / "src" / "TestMod"
+    source.mkdir(parents=True)
+    (source / "mod_info.json").write_text("{}")
+    (source / "zipslip_probe_link").symlink_to("mod_info.json")
+    archive_path = tmp_path / "symlink.7z"
+    with py7zr.SevenZipFile(archive_path, "w") as archive:
+        archive.writeall(source, arcname="TestMod")
+    (source / "zipslip_probe_link").unlink()
+    mods_dir = tmp_path / "game" / "mods"
+    mods_dir.mkdir(parents=True)
+
+    extractor = archive_extractor.ArchiveExtractor(Mock())
+    assert extractor.extract_archive(archive_path, mods_dir, True) is False
+    _assert_nothing_extracted(tmp_path, mods_dir)
+
+
+def test_read_mod_info_metadata_parses_head_once():
+    """Fields found in the head are parsed once and the tail is never read."""
+    from src.utils import mod_utils
+    padding = "\n".join(f'  "x{i}": "{"y" * 40}",' for i in range(400))
+    head_hit = f'{{\n  "id": "mod", "name": "Mod",\n  "version": "1.2.3", "gameVersion": "0.97a",\n{padding}\n}}'
+    tail_only = f'{{\n  "name": "Mod",\n{padding}\n  "id": "late", "version": "2.0", "gameVersion": "0.97a"\n}}'
+    assert len(head_hit) > mod_utils.MOD_INFO_HEAD_SIZE
+    
+    extract = Mock(wraps=mod_utils.extract_all_metadata_from_text)
+    stream = io.BytesIO(head_hit.encode())
+    assert mod_utils.read_mod_info_metadata(stream, extract)['version'] == "1.2.3"
+    assert extract.call_count == 1
+    assert stream.tell() == mod_utils.MOD_INFO_HEAD_SIZE
+    
+    extract.reset_mock()
+    assert mod_utils.read_mod_info_metadata(io.BytesIO(tail_only.encode()), extract)['id'] == "late"
+    assert extract.call_count == 2
+
+def _versioned_mod_zip(tmp_path, version):
+    archive_path = tmp_path / f"TestMod-{version}.zip"
+    archive_path.write_bytes(make_in_memory_zip({
+        "TestMod/mod_info.json": json.dumps({"id": "testmod", "version": version}),
+        "TestMod/data.txt": version,
+    }))
+    return archive_path
+
+
+@pytest.fixture
+def sidecar_install(tmp_path):
+    """TestMod 1.0.0 installed by the extractor, plus a spy on mod_info.json reads."""
+    from src.core import archive_extractor
+    mods_dir = tmp_path / "mods"
+    mods_dir.mkdir()
+    extractor = archive_extractor.ArchiveExtractor(Mock())
+    assert extractor.extract_archive(_versioned_mod_zip(tmp_path, "1.0.0"), mods_dir, False, "1.0.0") is True
+    mod_root = mods_dir / "TestMod"
+    sidecar = mod_root / archive_extractor.INSTALLED_VERSION_SIDECAR
+    assert json.loads(sidecar.read_text())['version'] == "1.0.0"
+    with patch.object(archive_extractor, '_read_mod_info_head',
+                      wraps=archive_extractor._read_mod_info_head) as reads:
+        yield extractor, mods_dir, mod_root, sidecar, reads
+
+
+def test_version_sidecar_equal_version_skips(tmp_path, sidecar_install):
+    extractor, mods_dir, mod_root, sidecar, reads = sidecar_install
+    
+    result = extractor.extract_archive(_versioned_mod_zip(tmp_path, "1.0.0"), mods_dir, False, "1.0.0")
+    
+    assert result == 'skipped'
+    assert not reads.called
+
+
+def test_version_sidecar_newer_version_replaces(tmp_path, sidecar_install):
+    extractor, mods_dir, mod_root, sidecar, reads = sidecar_install
+    
+    result = extractor.extract_archive(_versioned_mod_zip(tmp_path, "1.1.0"), mods_dir, False, "1.1.0")
+    
+    assert result is True
+    assert not reads.called
+    assert (mod_root / "data.txt").read_text() == "1.1.0"
+    assert json.loads(sidecar.read_text())['version'] == "1.1.0"
+
+
+@pytest.mark.parametrize("damage", ["missing", "corrupt", "stale"])
+def test_version_sidecar_fallback_reads_mod_info(tmp_path, sidecar_install, damage):
+    """Without a usable sidecar the installed mod_info.json decides."""
+    import os
+    extractor, mods_dir, mod_root, sidecar, reads = sidecar_install
+    if damage == "missing":
+        sidecar.unlink()
+    elif damage == "corrupt":
+        sidecar.write_text("{not json")
+    else:
+        # mod_info.json edited after install: the recorded version no longer applies
+        mod_info = mod_root / "mod_info.json"
+        mod_info.write_text(json.dumps({"id": "testmod", "version": "0.9.0"}))
+        later = os.stat(mod_info).st_mtime_ns + 10**9
+        os.utime(mod_info, ns=(later, later))
+    
+    result = extractor.extract_archive(_versioned_mod_zip(tmp_path, "1.0.0"), mods_dir, False, "1.0.0")
+    
+    assert reads.called
+    if damage == "stale":
+        assert result is True
+        assert json.loads((mod_root / "mod_info.json").read_text())['version'] == "1.0.0"
+    else:
+        assert result == 'skipped'
 """
 Integration tests for complete user scenarios.
 Tests end-to-end workflows and complex interactions.
@@ -1064,10 +1278,10 @@ class TestCompleteWorkflows:
         log_mock = Mock()
         installer = ModInstaller(log_mock)
         
-        with patch('src.core.installer.requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             # Mock successful download
             mock_response = Mock()
-            mock_response.iter_content = lambda chunk_size: [b'fake_zip_data']
+            mock_response.iter_content = lambda chunk_size: [b'PK\x03\x04fake_zip_data']
             mock_response.headers = {'content-type': 'application/zip'}
             mock_response.raise_for_status = Mock()
             mock_get.return_value = mock_response
@@ -1218,12 +1432,12 @@ class TestDownloadScenarios:
             {'name': 'Mod3', 'download_url': 'http://example.com/mod3.zip'}
         ]
         
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             # Mock successful downloads
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.headers = {'Content-Type': 'application/zip'}
-            mock_response.iter_content = Mock(return_value=[b'fake zip content'])
+            mock_response.iter_content = Mock(return_value=[b'PK\x03\x04fake zip content'])
             mock_get.return_value = mock_response
             
             results = []
@@ -1244,7 +1458,7 @@ class TestDownloadScenarios:
         
         mod = {'name': 'SlowMod', 'download_url': 'http://slow.example.com/mod.zip'}
         
-        with patch('requests.get', side_effect=Exception("Timeout")):
+        with patch.object(installer.session, 'get', side_effect=Exception("Timeout")):
             temp_path, is_7z = installer.download_archive(mod)
             
             # Download should fail gracefully
@@ -1260,7 +1474,7 @@ class TestDownloadScenarios:
         
         mod = {'name': 'MissingMod', 'download_url': 'http://example.com/missing.zip'}
         
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 404
             mock_response.raise_for_status.side_effect = Exception("404 Not Found")
@@ -1278,11 +1492,11 @@ class TestDownloadScenarios:
         
         mod = {'name': 'Compressed', 'download_url': 'http://example.com/mod.7z'}
         
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.headers = {'Content-Type': 'application/x-7z-compressed'}
-            mock_response.iter_content = Mock(return_value=[b'7z content'])
+            mock_response.iter_content = Mock(return_value=[b"7z\xbc\xaf'\x1c content"])
             mock_get.return_value = mock_response
             
             temp_path, is_7z = installer.download_archive(mod)
@@ -1306,7 +1520,7 @@ class TestDownloadScenarios:
         mock_response.headers = {'Content-Type': 'text/html'}
         mock_response.raise_for_status = MagicMock()
         
-        with patch('requests.get', return_value=mock_response):
+        with patch.object(installer.session, 'get', return_value=mock_response):
             temp_path, is_7z = installer.download_archive(gdrive_mod)
         
         # Should return GDRIVE_HTML indicator
@@ -1329,7 +1543,7 @@ class TestDownloadScenarios:
         mock_response.raise_for_status = MagicMock()
         mock_response.iter_content = MagicMock(return_value=[b'fake html'])
         
-        with patch('requests.get', return_value=mock_response), \
+        with patch.object(installer.session, 'get', return_value=mock_response), \
              patch('tempfile.mkstemp', return_value=(99, '/tmp/test.zip')):
             temp_path, is_7z = installer.download_archive(regular_mod)
         
@@ -1348,7 +1562,7 @@ class TestURLValidation:
             {'name': 'OtherMod', 'download_url': 'https://example.com/mod.zip'}
         ]
         
-        with patch('requests.head') as mock_head:
+        with patch.object(PROBE_SESSION, 'head') as mock_head:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_head.return_value = mock_response
@@ -1380,7 +1594,7 @@ class TestURLValidation:
                 mock_resp.status_code = 200
                 return mock_resp
         
-        with patch('requests.head', side_effect=mock_request):
+        with patch.object(PROBE_SESSION, 'head', side_effect=mock_request):
             results = validate_mod_urls(mods)
             
             # Should have retried (call_count will be 2+ due to retry logic)
@@ -1393,7 +1607,7 @@ class TestURLValidation:
             {'name': 'BlockedMod', 'download_url': 'http://example.com/mod.zip'}
         ]
         
-        with patch('requests.head') as mock_head, patch('requests.get') as mock_get:
+        with patch.object(PROBE_SESSION, 'head') as mock_head, patch.object(PROBE_SESSION, 'get') as mock_get:
             # HEAD returns 403
             mock_head_response = MagicMock()
             mock_head_response.status_code = 403
@@ -1430,7 +1644,7 @@ class TestURLValidation:
             {'name': 'Mod3', 'download_url': 'https://other.site/mod3.zip'}
         ]
         
-        with patch('requests.head') as mock_head:
+        with patch.object(PROBE_SESSION, 'head') as mock_head:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_head.return_value = mock_response
@@ -1439,11 +1653,313 @@ class TestURLValidation:
             
             # Should group by domain
             assert 'cdn.example.com' in results['other'] or 'other.site' in results['other']
+    
+    def test_probe_session_fails_fast(self):
+        """URL probes retry once without backoff; downloads keep their adapter retries."""
+        from src.utils import network_utils
+        probe_retry = PROBE_SESSION.get_adapter('https://example.com').max_retries
+        download_retry = network_utils.SESSION.get_adapter('https://example.com').max_retries
+        assert probe_retry.total == 1 and probe_retry.backoff_factor == 0
+        assert download_retry.total == 3 and download_retry.backoff_factor > 0
+        
+        with patch.object(PROBE_SESSION, 'head') as mock_head, \
+             patch.object(network_utils.SESSION, 'head') as download_head:
+            mock_head.return_value = MagicMock(status_code=200)
+            validate_mod_urls([{'name': 'Mod', 'download_url': 'https://example.com/mod.zip'}])
+        assert mock_head.called and not download_head.called
+    
+    @pytest.fixture
+    def rate_limited_server(self):
+        """Local server answering every request with 429 and a one-hour Retry-After."""
+        import http.server
+        import threading
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def _reply(self):
+                self.send_response(429)
+                self.send_header('Retry-After', '3600')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            do_HEAD = do_GET = _reply
+            
+            def log_message(self, *args):
+                pass
+        
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_address[1]}/mod.zip'
+        server.shutdown()
+        server.server_close()
+    
+    def test_probe_ignores_long_retry_after(self, rate_limited_server):
+        """A 429 with a huge Retry-After fails the probe within about one timeout."""
+        started = time.monotonic()
+        results = validate_mod_urls([{'name': 'Mod', 'download_url': rate_limited_server}], timeout=1)
+        
+        assert time.monotonic() - started < 2
+        assert results['failed'][0]['status'] == 429
+    
+    def test_download_session_caps_retry_after(self, rate_limited_server):
+        """The download session honours Retry-After only up to its cap."""
+        from src.utils import network_utils
+        session = network_utils.create_session(retries=1, backoff_factor=0, max_retry_after=0.2)
+        started = time.monotonic()
+        response = session.get(rate_limited_server, timeout=1)
+        
+        assert response.status_code == 429
+        assert 0.2 <= time.monotonic() - started < 2
+        assert network_utils.SESSION.get_adapter(rate_limited_server).max_retries.max_retry_after == \
+            network_utils.MAX_RETRY_AFTER
+
+    CACHED_URL = 'https://example.com/mod.zip'
+    
+    def _validate_with_cache(self, cache_file, cache_ttl=86400):
+        with patch.object(PROBE_SESSION, 'head') as mock_head:
+            mock_head.return_value = MagicMock(status_code=200)
+            results = validate_mod_urls([{'name': 'Mod', 'download_url': self.CACHED_URL}],
+                                        cache_path=cache_file, cache_ttl=cache_ttl)
+        return results, mock_head
+    
+    def test_validation_cache_hit(self, tmp_path):
+        """A fresh cached 2xx skips the probe."""
+        cache_file = tmp_path / "url_cache.json"
+        cache_file.write_text(json.dumps({self.CACHED_URL: {
+            'status': 200, 'category': 'other', 'domain': 'example.com', 'ts': time.time()}}))
+        
+        results, mock_head = self._validate_with_cache(cache_file)
+        
+        assert not mock_head.called
+        assert results['other']['example.com'][0]['name'] == 'Mod'
+    
+    def test_validation_cache_ttl_expired(self, tmp_path):
+        """An entry older than the TTL is probed again and refreshed."""
+        cache_file = tmp_path / "url_cache.json"
+        cache_file.write_text(json.dumps({self.CACHED_URL: {
+            'status': 200, 'category': 'other', 'domain': 'example.com', 'ts': time.time() - 120}}))
+        
+        results, mock_head = self._validate_with_cache(cache_file, cache_ttl=60)
+        
+        assert mock_head.call_count == 1
+        assert json.loads(cache_file.read_text())[self.CACHED_URL]['ts'] > time.time() - 60
+    
+    @pytest.mark.parametrize("entry", [
+        {'status': 200, 'domain': 'example.com', 'ts': 0},
+        {'status': 200, 'category': 'failed', 'domain': 'example.com', 'ts': 0},
+        {'status': '200', 'category': 'other', 'domain': 'example.com', 'ts': 0},
+        ['not', 'a', 'dict'],
+    ], ids=["missing-category", "unknown-category", "bad-status", "not-a-dict"])
+    def test_validation_cache_malformed_entry(self, tmp_path, entry):
+        """A malformed entry is discarded and the URL probed instead of raising KeyError."""
+        cache_file = tmp_path / "url_cache.json"
+        if isinstance(entry, dict):
+            entry = {**entry, 'ts': time.time()}
+        cache_file.write_text(json.dumps({self.CACHED_URL: entry}))
+        
+        results, mock_head = self._validate_with_cache(cache_file)
+        
+        assert mock_head.call_count == 1
+        assert 'example.com' in results['other']
+        assert json.loads(cache_file.read_text())[self.CACHED_URL]['category'] == 'other'
+    
+    def test_validation_progress_counts_every_mod(self, tmp_path):
+        """Progress runs against the whole modlist; cached and URL-less mods start as done."""
+        cache_file = tmp_path / "url_cache.json"
+        cache_file.write_text(json.dumps({self.CACHED_URL: {
+            'status': 200, 'category': 'other', 'domain': 'example.com', 'ts': time.time()}}))
+        mods = [{'name': 'Cached', 'download_url': self.CACHED_URL},
+                {'name': 'NoUrl', 'download_url': ''},
+                {'name': 'Probed1', 'download_url': 'https://other.example/a.zip'},
+                {'name': 'Probed2', 'download_url': 'https://other.example/b.zip'}]
+        progress = []
+        
+        with patch.object(PROBE_SESSION, 'head', return_value=MagicMock(status_code=200)), \
+             patch('src.utils.network_utils.PROGRESS_INTERVAL', 0):
+            validate_mod_urls(mods, progress_callback=lambda done, total, name: progress.append((done, total)),
+                              cache_path=cache_file)
+        
+        assert progress == [(3, 4), (4, 4)]
+        
+        # Nothing left to probe: a single completed report
+        progress.clear()
+        validate_mod_urls(mods[:2], progress_callback=lambda done, total, name: progress.append((done, total)),
+                          cache_path=cache_file)
+        assert progress == [(2, 2)]
+    
+    def test_validation_cache_not_a_mapping(self, tmp_path):
+        cache_file = tmp_path / "url_cache.json"
+        cache_file.write_text("[1, 2, 3]")
+        
+        results, mock_head = self._validate_with_cache(cache_file)
+        
+        assert mock_head.call_count == 1
+    
+    @pytest.fixture
+    def github_api(self, monkeypatch):
+        """Fresh GitHub release cache and a session whose API answer each test sets."""
+        from src.utils import network_utils
+        monkeypatch.setattr(network_utils, '_github_release_assets', {})
+        monkeypatch.setattr(network_utils, '_github_release_locks', {})
+        monkeypatch.setattr(network_utils, '_github_api_blocked_until', 0.0)
+        session = Mock()
+        session.head.return_value = MagicMock(status_code=200)
+        return network_utils, session
+    
+    RELEASE_URL = 'https://github.com/user/repo/releases/download/v1.0/mod.zip'
+    
+    def test_github_release_lookup_cached(self, github_api, monkeypatch):
+        """One API call covers the release; the positive result expires after the TTL."""
+        network_utils, session = github_api
+        session.get.return_value = MagicMock(status_code=200, json=lambda: {'assets': [{'name': 'mod.zip'}]})
+        
+        assert network_utils._github_release_has_asset(self.RELEASE_URL, session, 3) is True
+        assert network_utils._github_release_has_asset(self.RELEASE_URL, session, 3) is True
+        assert session.get.call_count == 1
+        
+        monkeypatch.setattr(network_utils, 'GITHUB_RELEASE_CACHE_TTL', 0)
+        assert network_utils._github_release_has_asset(self.RELEASE_URL, session, 3) is True
+        assert session.get.call_count == 2
+    
+    def test_github_release_failure_not_cached(self, github_api):
+        """A failed lookup falls back to HEAD and is retried on the next check."""
+        network_utils, session = github_api
+        session.get.return_value = MagicMock(status_code=404)
+        mod = {'name': 'Mod', 'download_url': self.RELEASE_URL}
+        
+        assert network_utils._check_url(mod, 0, session, 3)[1:5:3] == ('github', 200)
+        network_utils._check_url(mod, 0, session, 3)
+        assert session.get.call_count == 2
+        assert session.head.call_count == 2
+    
+    @pytest.mark.parametrize("status, headers", [
+        (403, {'X-RateLimit-Remaining': '0'}),
+        (429, {'Retry-After': '60'}),
+    ])
+    def test_github_rate_limit_stops_api_calls(self, github_api, status, headers):
+        """A 403/429 is 'unknown': HEAD decides, and the API is skipped until the limit resets."""
+        network_utils, session = github_api
+        session.get.return_value = MagicMock(status_code=status, headers=headers)
+        mod = {'name': 'Mod', 'download_url': self.RELEASE_URL}
+        other = {'name': 'Other', 'download_url': 'https://github.com/user/other/releases/download/v2/o.zip'}
+        
+        assert network_utils._check_url(mod, 0, session, 3)[4] == 200
+        assert network_utils._check_url(other, 1, session, 3)[4] == 200
+        assert session.get.call_count == 1
+        assert session.head.call_count == 2
+        assert network_utils._github_api_blocked_until > time.time()
+        
+        network_utils._github_api_blocked_until = 0.0
+        session.get.return_value = MagicMock(status_code=200, json=lambda: {'assets': [{'name': 'mod.zip'}]})
+        assert network_utils._github_release_has_asset(self.RELEASE_URL, session, 3) is True
 
 
 class TestConcurrentDownloads:
     """Test concurrent download behavior."""
     
+    @staticmethod
+    def _pipeline_controller(extracted):
+        """Controller over a Mock window whose installer records every extraction."""
+        import threading
+        from contextlib import nullcontext
+        from src.gui.installation_controller import InstallationController
+        window = Mock()
+        window.is_installing = True
+        window.is_paused = False
+        window.current_executor = None
+        window._get_mod_game_version.return_value = None
+        installer = window.mod_installer
+        installer.open_archive.side_effect = lambda path, is_7z: nullcontext(None)
+        
+        def extract(path, mods_dir, is_7z, expected_version, archive):
+            extracted.append(Path(path).read_text())
+            return True
+        installer.extract_archive.side_effect = extract
+        controller = InstallationController(window)
+        controller._progress_lock = threading.Lock()
+        controller._progress_done = 0
+        controller._progress_total = 0
+        return controller
+    
+    def test_pipeline_extracts_every_download(self, tmp_path):
+        """Every archive handed over by the download workers is extracted and removed."""
+        import queue
+        import threading
+        from model_types import DownloadResult
+        mods = [{'name': f'Mod{i}', 'mod_version': '1.0', 'mod_id': f'mod{i}', 'gameVersion': '0.97a'}
+                for i in range(6)]
+        extracted = []
+        controller = self._pipeline_controller(extracted)
+        
+        def download(mod, skip_gdrive_check, if_changed):
+            archive = tmp_path / f"{mod['name']}.zip"
+            archive.write_text(mod['name'])
+            return DownloadResult(str(archive), False)
+        controller.mod_installer.download_archive.side_effect = download
+        
+        extract_queue = queue.Queue(maxsize=2)
+        stop_event, downloads_done = threading.Event(), threading.Event()
+        results = {}
+        extractor = threading.Thread(target=lambda: results.update(
+            result=controller._drain_extract_queue(extract_queue, stop_event, downloads_done,
+                                                   tmp_path / "mods", Mock(), len(mods))))
+        extractor.start()
+        downloaded, _, _ = controller.download_mods_parallel(mods, extract_queue, stop_event, downloads_done)
+        extractor.join(timeout=10)
+        
+        assert len(downloaded) == len(mods)
+        assert sorted(extracted) == sorted(mod['name'] for mod in mods)
+        assert results['result'] == (len(mods), 0, [])
+        assert not list(tmp_path.glob("*.zip"))
+    
+    def test_drain_sees_archive_queued_after_timeout(self, tmp_path):
+        """An archive put just after a timed-out get is still extracted once downloads are done."""
+        import queue
+        import threading
+        
+        class LatePutQueue(queue.Queue):
+            # The first timed get misses the item, as when the put lands right after the timeout
+            missed = False
+            
+            def get(self, block=True, timeout=None):
+                if timeout is not None and not self.missed:
+                    self.missed = True
+                    raise queue.Empty
+                return super().get(block, timeout)
+        
+        archive = tmp_path / "Late.zip"
+        archive.write_text("Late")
+        extract_queue = LatePutQueue()
+        extract_queue.put(({'name': 'Late'}, str(archive), False))
+        downloads_done = threading.Event()
+        downloads_done.set()
+        extracted = []
+        controller = self._pipeline_controller(extracted)
+        
+        result = controller._drain_extract_queue(extract_queue, threading.Event(), downloads_done,
+                                                 tmp_path / "mods", Mock(), 1)
+        
+        assert extracted == ["Late"]
+        assert result == (1, 0, [])
+    
+    def test_canceled_download_not_leaked(self, tmp_path):
+        """An archive finished after cancel is deleted instead of left for nobody."""
+        import queue
+        import threading
+        from src.gui.installation_controller import InstallationController
+        from model_types import DownloadResult
+        archive = tmp_path / "modlist_done.zip"
+        archive.write_bytes(b"PK\x03\x04data")
+        window = Mock()
+        window.mod_installer.download_archive.return_value = DownloadResult(str(archive), False)
+        controller = InstallationController(window)
+        stop_event = threading.Event()
+        stop_event.set()
+        
+        result = controller._download_and_enqueue({'name': 'Mod'}, False, queue.Queue(maxsize=1), stop_event)
+        
+        assert result.temp_path is None
+        assert not archive.exists()
+    
     def test_executor_max_workers(self):
         """Test that executor respects max_workers limit."""
         log_callback = Mock()
@@ -1452,7 +1968,7 @@ class TestConcurrentDownloads:
         mods = [{'name': f'Mod{i}', 'download_url': f'http://example.com/mod{i}.zip'} 
                 for i in range(10)]
         
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.headers = {'Content-Type': 'application/zip'}
@@ -1537,6 +2053,10 @@ def mock_app(temp_dir):
     mock_root.protocol = Mock()
     mock_root.after = Mock()
     mock_root.update_idletasks = Mock()
+    mock_root.winfo_x.return_value = 100
+    mock_root.winfo_y.return_value = 100
+    mock_root.winfo_width.return_value = 800
+    mock_root.winfo_height.return_value = 600
     
     # Mock ttk.Style
     with patch('tkinter.ttk.Style'), \
@@ -2137,6 +2657,27 @@ class TestBackupRetentionPolicy:
         assert len(backup_mgr.list_backups()) == 3, "Should have 3 backups remaining"
 
 
+class TestCleanupTempFiles:
+    """Test _cleanup_temp_files leaves scratch dirs of live runs alone."""
+    
+    def test_only_stale_run_dirs_removed(self, mock_app, tmp_path, monkeypatch):
+        import os
+        monkeypatch.setattr(tempfile, 'gettempdir', lambda: str(tmp_path))
+        stale = tmp_path / "modlist_run_stale"
+        fresh = tmp_path / "modlist_run_fresh"
+        for run_dir in (stale, fresh):
+            run_dir.mkdir()
+            (run_dir / "download.zip").write_bytes(b"data")
+        day_old = time.time() - 2 * 86400
+        os.utime(stale, (day_old, day_old))
+        mock_app.downloaded_temp_files = []
+        
+        mock_app._cleanup_temp_files()
+        
+        assert not stale.exists()
+        assert (fresh / "download.zip").exists()
+
+
 class TestSaveConfigFunction:
     """Test save_modlist_config functionality."""
     
@@ -2412,6 +2953,84 @@ class TestRefreshMetadataButton:
         assert mock_app.display_modlist_info.called
 
 
+class TestScanInstalledModsCached:
+    """Test the persistent installed-mods scan cache."""
+    
+    @staticmethod
+    def _write_mod(mods_dir, folder, version):
+        mod_dir = mods_dir / folder
+        mod_dir.mkdir(parents=True, exist_ok=True)
+        info = mod_dir / "mod_info.json"
+        info.write_text(json.dumps({"id": folder.lower(), "name": folder, "version": version}))
+        return info
+    
+    @staticmethod
+    def _scan(mods_dir, cache_file):
+        from src.utils import mod_utils
+        with patch.object(mod_utils, '_read_mod_info_files', wraps=mod_utils._read_mod_info_files) as reads:
+            results = mod_utils.scan_installed_mods_cached(mods_dir, cache_file)
+        read_paths = [path for call_args in reads.call_args_list for path in call_args.args[0]]
+        return {folder.name: metadata['version'] for folder, metadata in results}, read_paths
+    
+    def test_unchanged_mods_reuse_cache(self, tmp_path):
+        mods_dir = tmp_path / "mods"
+        cache_file = tmp_path / "cache" / "installed.json"
+        self._write_mod(mods_dir, "Alpha", "1.0.0")
+        self._write_mod(mods_dir, "Beta", "2.0.0")
+        
+        first, first_reads = self._scan(mods_dir, cache_file)
+        second, second_reads = self._scan(mods_dir, cache_file)
+        
+        assert first == second == {"Alpha": "1.0.0", "Beta": "2.0.0"}
+        assert len(first_reads) == 2
+        assert second_reads == []
+    
+    def test_edited_mod_info_rescanned(self, tmp_path):
+        """Editing mod_info.json in place (mods_dir mtime unchanged) is picked up."""
+        import os
+        mods_dir = tmp_path / "mods"
+        cache_file = tmp_path / "installed.json"
+        info = self._write_mod(mods_dir, "Alpha", "1.0.0")
+        self._write_mod(mods_dir, "Beta", "2.0.0")
+        self._scan(mods_dir, cache_file)
+        dir_mtime = os.stat(mods_dir).st_mtime_ns
+        
+        # Same size, so only the mtime tells the edit apart
+        info.write_text(info.read_text().replace("1.0.0", "1.0.1"))
+        later = os.stat(info).st_mtime_ns + 10**9
+        os.utime(info, ns=(later, later))
+        
+        versions, reads = self._scan(mods_dir, cache_file)
+        
+        assert os.stat(mods_dir).st_mtime_ns == dir_mtime
+        assert versions == {"Alpha": "1.0.1", "Beta": "2.0.0"}
+        assert reads == [str(mods_dir / "Alpha")]
+    
+    @pytest.mark.parametrize("cache_text", [
+        '{"mods_dir": "trunc',
+        '[1, 2]',
+        None,
+        '{"mods_dir": MODS, "entries": ["Alpha"]}',
+        '{"mods_dir": MODS, "entries": {"Alpha": "oops", "Beta": {"signature": 1}}}',
+    ], ids=["truncated", "not-a-mapping", "binary", "entries-list", "bad-entries"])
+    def test_corrupt_cache_recovers(self, tmp_path, cache_text):
+        mods_dir = tmp_path / "mods"
+        cache_file = tmp_path / "installed.json"
+        self._write_mod(mods_dir, "Alpha", "1.0.0")
+        self._write_mod(mods_dir, "Beta", "2.0.0")
+        if cache_text is None:
+            cache_file.write_bytes(b"\xff\xfe\x00garbage")
+        else:
+            cache_file.write_text(cache_text.replace("MODS", json.dumps(str(mods_dir.resolve()))))
+        
+        versions, reads = self._scan(mods_dir, cache_file)
+        
+        assert versions == {"Alpha": "1.0.0", "Beta": "2.0.0"}
+        assert len(reads) == 2
+        # The rewritten cache serves the next scan
+        assert self._scan(mods_dir, cache_file) == (versions, [])
+
+
 class TestDragAndDropEdgeCases:
     """Test drag & drop stability with edge cases."""
     
@@ -2513,7 +3132,7 @@ class TestNetworkErrorRecovery:
         installer = ModInstaller(log_callback)
         
         # Mock timeout exception
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_get.side_effect = requests.exceptions.Timeout("Connection timeout")
             
             mod = {'download_url': 'http://example.com/slow.zip', 'name': 'SlowMod'}
@@ -2531,7 +3150,7 @@ class TestNetworkErrorRecovery:
         installer = ModInstaller(log_callback)
         
         # Mock connection error
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
             
             mod = {'download_url': 'http://example.com/unreachable.zip', 'name': 'UnreachableMod'}
@@ -2547,7 +3166,7 @@ class TestNetworkErrorRecovery:
         installer = ModInstaller(log_callback)
         
         # Mock a download that fails mid-stream
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.headers = {'Content-Type': 'application/zip'}
@@ -2576,7 +3195,7 @@ class TestNetworkErrorRecovery:
         corrupted_zip.write_bytes(b"NOT A VALID ZIP FILE")
         
         # Mock download to return corrupted file
-        with patch('requests.get') as mock_get:
+        with patch.object(installer.session, 'get') as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.headers = {'Content-Type': 'application/zip'}
@@ -2593,6 +3212,178 @@ class TestNetworkErrorRecovery:
                 assert result is None
                 assert is_7z is False
     
+    def test_html_body_rejected_as_archive(self, tmp_path):
+        """An HTML error page or Drive interstitial must not pass the post-download check."""
+        installer = ModInstaller(Mock())
+        html_page = tmp_path / "download.zip"
+        html_page.write_bytes(b"<!DOCTYPE html><html><head><title>Google Drive</title></head></html>")
+        
+        assert installer._validate_archive_integrity(str(html_page)) is None
+        
+        # Real signatures pass the cheap check and name the format, whatever the file is called
+        zip_file = tmp_path / "real.7z"
+        zip_file.write_bytes(make_in_memory_zip({"Mod/mod_info.json": "{}"}))
+        assert installer._validate_archive_integrity(str(zip_file)) == 'zip'
+        sevenzip_file = tmp_path / "real.zip"
+        sevenzip_file.write_bytes(b"7z\xbc\xaf'\x1c rest")
+        assert installer._validate_archive_integrity(str(sevenzip_file)) == '7z'
+    
+    @pytest.mark.parametrize("url, body, expected_7z", [
+        ('http://example.com/mod.zip', b"7z\xbc\xaf'\x1c body", True),
+        ('http://example.com/mod.7z', b"PK\x03\x04 body", False),
+    ], ids=["7z-body-zip-url", "zip-body-7z-url"])
+    def test_download_format_from_signature(self, url, body, expected_7z):
+        """DownloadResult.is_7z follows the magic bytes, not the URL guess."""
+        installer = ModInstaller(Mock())
+        with patch.object(installer.session, 'get') as mock_get:
+            mock_response = MagicMock(status_code=200, headers={})
+            mock_response.iter_content = Mock(return_value=[body])
+            mock_get.return_value = mock_response
+            temp_path, is_7z = installer.download_archive({'name': 'Mod', 'download_url': url})
+        
+        assert temp_path and is_7z is expected_7z
+        installer.close()
+    
+    def test_html_download_reports_invalid_archive(self):
+        """download_archive discards an HTML body served with an archive content type."""
+        log_callback = Mock()
+        installer = ModInstaller(log_callback)
+        
+        with patch.object(installer.session, 'get') as mock_get:
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.headers = {'Content-Type': 'application/zip'}
+            mock_response.iter_content = Mock(return_value=[b"<html><body>Quota exceeded</body></html>"])
+            mock_get.return_value = mock_response
+            
+            with patch('time.sleep'):
+                temp_path, is_7z = installer.download_archive(
+                    {'name': 'HtmlMod', 'download_url': 'http://example.com/mod.zip'})
+        
+        assert temp_path is None
+        assert any('not a valid archive' in str(c.args[0]) for c in log_callback.call_args_list)
+    
+    @staticmethod
+    def _download_response(status, chunks, headers=None, fail_after=False):
+        response = MagicMock()
+        response.status_code = status
+        response.headers = {'Content-Type': 'application/zip', **(headers or {})}
+        
+        def body(chunk_size=None):
+            yield from chunks
+            if fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+        response.iter_content = Mock(side_effect=body)
+        return response
+    
+    @pytest.mark.parametrize("resume_status, second_body, expected", [
+        (206, [b"rest of archive"], b"PK\x03\x04first half|rest of archive"),
+        (200, [b"PK\x03\x04whole new archive"], b"PK\x03\x04whole new archive"),
+    ], ids=["resume-206", "restart-on-200"])
+    def test_interrupted_download_resumes_with_if_range(self, resume_status, second_body, expected):
+        """A cut stream is resumed with Range + If-Range; a 200 reply restarts the file."""
+        installer = ModInstaller(Mock())
+        written = {}
+        original_validate = installer._validate_archive_integrity
+        
+        def validate(path, deep=False):
+            written['data'] = Path(path).read_bytes()
+            return original_validate(path, deep)
+        
+        first = self._download_response(200, [b"PK\x03\x04first half|"], {'ETag': '"v1"'}, fail_after=True)
+        second = self._download_response(resume_status, second_body, {'ETag': '"v1"'})
+        with patch.object(installer.session, 'get', side_effect=[first, second]) as mock_get, \
+             patch.object(installer, '_validate_archive_integrity', side_effect=validate), \
+             patch('time.sleep'):
+            temp_path, is_7z = installer.download_archive(
+                {'name': 'ResumeMod', 'download_url': 'http://example.com/mod.zip'})
+        
+        try:
+            assert temp_path and temp_path not in ('GDRIVE_HTML', 'NOT_MODIFIED')
+            assert written['data'] == expected
+            first_headers = mock_get.call_args_list[0].kwargs['headers']
+            resume_headers = mock_get.call_args_list[1].kwargs['headers']
+            assert 'Range' not in first_headers
+            assert resume_headers['Range'] == "bytes=15-"
+            assert resume_headers['If-Range'] == '"v1"'
+        finally:
+            installer.close()
+    
+    def test_short_body_resumed(self):
+        """A body that ends before Content-Length is treated as cut off and resumed."""
+        installer = ModInstaller(Mock())
+        first = self._download_response(200, [b"PK\x03\x04head|"], {'ETag': '"v1"', 'Content-Length': '13'})
+        second = self._download_response(206, [b"tail"], {'ETag': '"v1"', 'Content-Length': '4'})
+        with patch.object(installer.session, 'get', side_effect=[first, second]) as mock_get, \
+             patch('time.sleep'):
+            temp_path, _ = installer.download_archive(
+                {'name': 'Short', 'download_url': 'http://example.com/mod.zip'})
+        
+        try:
+            assert Path(temp_path).read_bytes() == b"PK\x03\x04head|tail"
+            assert mock_get.call_args_list[1].kwargs['headers']['Range'] == 'bytes=9-'
+        finally:
+            installer.close()
+    
+    def test_resume_weak_etag_uses_last_modified(self):
+        """If-Range needs a strong validator, so a weak ETag falls back to Last-Modified."""
+        installer = ModInstaller(Mock())
+        last_modified = 'Wed, 01 Jan 2025 00:00:00 GMT'
+        first = self._download_response(200, [b"PK\x03\x04head|"],
+                                        {'ETag': 'W/"v1"', 'Last-Modified': last_modified}, fail_after=True)
+        second = self._download_response(206, [b"tail"])
+        with patch.object(installer.session, 'get', side_effect=[first, second]) as mock_get, \
+             patch('time.sleep'):
+            temp_path, _ = installer.download_archive(
+                {'name': 'WeakEtag', 'download_url': 'http://example.com/mod.zip'})
+        
+        try:
+            assert Path(temp_path).read_bytes() == b"PK\x03\x04head|tail"
+            assert mock_get.call_args_list[1].kwargs['headers'] == {
+                'Range': 'bytes=9-', 'If-Range': last_modified}
+        finally:
+            installer.close()
+    
+    def test_resume_without_validator_restarts(self):
+        """Without an ETag or Last-Modified the partial file is not trusted for a Range request."""
+        installer = ModInstaller(Mock())
+        first = self._download_response(200, [b"PK\x03\x04partial"], fail_after=True)
+        second = self._download_response(200, [b"PK\x03\x04complete"])
+        with patch.object(installer.session, 'get', side_effect=[first, second]) as mock_get, \
+             patch('time.sleep'):
+            temp_path, _ = installer.download_archive(
+                {'name': 'NoValidator', 'download_url': 'http://example.com/mod.zip'})
+        
+        try:
+            assert Path(temp_path).read_bytes() == b"PK\x03\x04complete"
+            assert 'Range' not in mock_get.call_args_list[1].kwargs['headers']
+        finally:
+            installer.close()
+    
+    def test_if_changed_not_modified(self):
+        """With if_changed the stored validators are sent and a 304 skips the download."""
+        import os
+        installer = ModInstaller(Mock())
+        mod = {'name': 'Cached', 'download_url': 'http://example.com/mod.zip',
+               'download_etag': '"v1"', 'download_last_modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+        not_modified = self._download_response(304, [])
+        with patch.object(installer.session, 'get', return_value=not_modified) as mock_get:
+            result = installer.download_archive(mod, if_changed=True)
+            assert result == ('NOT_MODIFIED', False)
+            # Nothing was written for the unchanged archive
+            run_tmpdir = installer._run_tmpdir
+            assert run_tmpdir is None or not os.listdir(run_tmpdir)
+            headers = mock_get.call_args.kwargs['headers']
+            assert headers == {'If-None-Match': '"v1"',
+                               'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+            
+            # Without if_changed (an update is expected) no conditional headers are sent
+            mock_get.return_value = self._download_response(200, [b"PK\x03\x04new version"])
+            temp_path, _ = installer.download_archive(mod)
+            assert mock_get.call_args.kwargs['headers'] == {}
+            assert Path(temp_path).read_bytes() == b"PK\x03\x04new version"
+        installer.close()
+    
     def test_ui_recovery_after_network_error(self, mock_app, monkeypatch):
         """Test that UI buttons are re-enabled after network error in Add Mod dialog."""
         from src.gui import dialogs
@@ -2646,5 +3437,67 @@ class TestAddModDialogRobustness:
         assert "Could not extract mod metadata" in source
 
 
+
+class TestStyledDialogPool:
+    """Test that closed StyledDialog windows are reused cleanly."""
+    
+    @pytest.fixture
+    def widgets(self, monkeypatch):
+        """Mock Frame/Label that register with a mock window, like Tk children do."""
+        from src.gui import dialogs
+        monkeypatch.setattr(dialogs, '_DIALOG_POOL', {})
+        monkeypatch.setattr(dialogs, '_create_button', Mock())
+        created = []
+        
+        def widget(master, *args, **kwargs):
+            child = Mock()
+            created.append(child)
+            if isinstance(master, tk.Toplevel):
+                name = str(id(child))
+                master.children[name] = child
+                child.destroy.side_effect = lambda: master.children.pop(name, None)
+            return child
+        monkeypatch.setattr(tk, 'Frame', widget)
+        monkeypatch.setattr(tk, 'Label', widget)
+        return created
+    
+    def test_two_dialogs_in_a_row_reuse_window(self, widgets):
+        from src.gui import dialogs
+        parent = tk.Tk()
+        
+        first = dialogs.StyledDialog(parent, "First", "one?", "question")
+        first_window = first.dialog
+        first_content = first_window.winfo_children()
+        assert first.show() is True
+        assert not first_window.winfo_ismapped()
+        
+        second = dialogs.StyledDialog(parent, "Second", "two?", "question",
+                                      [("Cancel", "cancel"), ("OK", True)])
+        
+        assert second.dialog is first_window
+        assert first_window.title_text == "Second"
+        assert all(child.destroy.called for child in first_content)
+        assert first_window.winfo_children() and not set(first_window.winfo_children()) & set(first_content)
+        # Only the new dialog's handlers answer: Return gives its first button, not "Yes"
+        assert second.show() == "cancel"
+        assert first.result is True
+        first_window._protocols["WM_DELETE_WINDOW"]()
+        assert second.result is None
+    
+    def test_pool_keyed_by_parent_and_type(self, widgets):
+        from src.gui import dialogs
+        parent = tk.Tk()
+        info = dialogs.StyledDialog(parent, "Info", "msg", "info")
+        info.show()
+        
+        other_type = dialogs.StyledDialog(parent, "Warn", "msg", "warning")
+        other_parent = dialogs.StyledDialog(tk.Tk(), "Info", "msg", "info")
+        
+        assert other_type.dialog is not info.dialog
+        assert other_parent.dialog is not info.dialog
+        # A destroyed pooled window is not handed out again
+        info.dialog.destroy()
+        assert dialogs.StyledDialog(parent, "Info", "msg", "info").dialog is not info.dialog
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])